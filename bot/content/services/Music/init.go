@@ -3,8 +3,11 @@ package music_services
 import (
 	"bytes"
 	"context"
+	"crypto/rand"
+	"encoding/hex"
 	"encoding/json"
 	"fmt"
+	"log"
 	"mybot/content/domain"
 	"net/http"
 	"strings"
@@ -28,6 +31,20 @@ type MusicResponse struct {
 	TrackID string `json:"track_id,omitempty"`
 	Title   string `json:"title,omitempty"`
 	Error   string `json:"error,omitempty"`
+	// FastAPI's HTTPException body; a string, or a list for validation errors
+	Detail json.RawMessage `json:"detail,omitempty"`
+}
+
+// errorMessage returns the error reason, falling back to FastAPI's detail
+func (r *MusicResponse) errorMessage() string {
+	if r.Error != "" || len(r.Detail) == 0 {
+		return r.Error
+	}
+	var detail string
+	if err := json.Unmarshal(r.Detail, &detail); err == nil {
+		return detail
+	}
+	return string(r.Detail)
 }
 
 // StatusResponse represents the current playback status
@@ -82,6 +99,15 @@ func (m *MusicService) findUserVoiceChannel(guildID, userID string) (string, err
 	return "", fmt.Errorf("user is not in a voice channel")
 }
 
+// newRequestID returns a random ID used to trace a request through the music bot
+func newRequestID() string {
+	buf := make([]byte, 16)
+	if _, err := rand.Read(buf); err != nil {
+		return ""
+	}
+	return hex.EncodeToString(buf)
+}
+
 // makeAPIRequest makes HTTP request to music bot API
 func (m *MusicService) makeAPIRequest(method, endpoint string, payload interface{}) (*MusicResponse, error) {
 	var body bytes.Buffer
@@ -97,21 +123,27 @@ func (m *MusicService) makeAPIRequest(method, endpoint string, payload interface
 		return nil, fmt.Errorf("failed to create request: %w", err)
 	}
 
+	// Logged so slow or failed requests can be matched to /debug/traces
+	requestID := newRequestID()
 	req.Header.Set("Content-Type", "application/json")
+	req.Header.Set("X-Request-ID", requestID)
 
+	started := time.Now()
 	resp, err := m.httpClient.Do(req)
 	if err != nil {
-		return nil, fmt.Errorf("failed to make request: %w", err)
+		log.Printf("Music API %s %s failed after %s (request_id=%s): %v", method, endpoint, time.Since(started), requestID, err)
+		return nil, fmt.Errorf("failed to make request (request_id=%s): %w", requestID, err)
 	}
 	defer resp.Body.Close()
+	log.Printf("Music API %s %s -> %d in %s (request_id=%s)", method, endpoint, resp.StatusCode, time.Since(started), requestID)
 
 	var result MusicResponse
 	if err := json.NewDecoder(resp.Body).Decode(&result); err != nil {
-		return nil, fmt.Errorf("failed to decode response: %w", err)
+		return nil, fmt.Errorf("failed to decode response (request_id=%s): %w", requestID, err)
 	}
 
 	if resp.StatusCode >= 400 {
-		return nil, fmt.Errorf("API error: %s", result.Error)
+		return nil, fmt.Errorf("API error (request_id=%s): %s", requestID, result.errorMessage())
 	}
 
 	return &result, nil
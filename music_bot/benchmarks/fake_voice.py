@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from typing import Callable, List, Optional, Tuple
+import discord
+from discord.player import AudioPlayer
+
+FRAME_SECONDS = 0.02
+
+class FakeWebSocket:
+    """Accepts speaking updates without a gateway"""
+
+    async def speak(self, state):
+        return None
+
+class FakeVoiceClient:
+    """Enough of discord.VoiceClient for both playback engines, recording sends"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, guild_id: int = 0):
+        self.loop = loop
+        self.client = SimpleNamespace(loop=loop)
+        self.ws = FakeWebSocket()
+        self.guild = SimpleNamespace(id=guild_id, voice_client=self)
+        self.channel = SimpleNamespace(id=guild_id, name="fake", bitrate=64000)
+        self.timeout = 1.0
+        self.encoder = None
+        self.packets: List[Tuple[float, bytes]] = []
+        self._connected = True
+        self._player: Optional[AudioPlayer] = None
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def wait_until_connected(self, timeout: Optional[float] = None) -> bool:
+        return self._connected
+
+    def send_audio_packet(self, data: bytes, encode: bool = True):
+        self.packets.append((time.perf_counter(), data))
+
+    def disconnect(self):
+        self._connected = False
+        self.guild.voice_client = None
+        self.stop()
+
+    # discord.VoiceClient playback API, used by VoiceClientEngine
+    def play(self, source: discord.AudioSource, *, after: Optional[Callable] = None):
+        self._player = AudioPlayer(source, self, after=after)
+        self._player.start()
+
+    def stop(self):
+        if self._player:
+            self._player.stop()
+            self._player = None
+
+    def pause(self):
+        if self._player:
+            self._player.pause()
+
+    def resume(self):
+        if self._player:
+            self._player.resume()
+
+    def is_playing(self) -> bool:
+        return self._player is not None and self._player.is_playing()
+
+    def is_paused(self) -> bool:
+        return self._player is not None and self._player.is_paused()
+
+    @property
+    def source(self) -> Optional[discord.AudioSource]:
+        return self._player.source if self._player else None
+
+class SyntheticSource(discord.AudioSource):
+    """Opus-shaped frames tagged with a track number, optionally costing CPU per read"""
+
+    def __init__(self, tag: int, frames: int, read_cost: float = 0.0):
+        self.tag = tag
+        self.frames = frames
+        self.read_cost = read_cost
+        self.frames_read = 0
+        self.cleaned_up = False
+        self._frame = bytes([0xFC, tag % 256]) + bytes(158)
+
+    def read(self) -> bytes:
+        if self.frames_read >= self.frames:
+            return b''
+        self.frames_read += 1
+        if self.read_cost:
+            # Busy-wait, like decoding, rather than sleeping
+            deadline = time.perf_counter() + self.read_cost
+            while time.perf_counter() < deadline:
+                pass
+        return self._frame
+
+    def is_opus(self) -> bool:
+        return True
+
+    def cleanup(self):
+        self.cleaned_up = True
+
+def frame_tag(data: bytes) -> Optional[int]:
+    """Track tag of a SyntheticSource frame, None for silence"""
+    return data[1] if len(data) > 2 and data[0] == 0xFC else None
+
+def start_loop() -> asyncio.AbstractEventLoop:
+    """Event loop on a background thread, standing in for the bot loop"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True, name="FakeBotLoop").start()
+    return loop
+
+def intervals_ms(packets: List[Tuple[float, bytes]]) -> List[float]:
+    times = [sent for sent, _ in packets]
+    return [(b - a) * 1000 for a, b in zip(times, times[1:])]
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
@@ -0,0 +1,80 @@
+"""Compare the stock per-guild player with the multiplexed sender
+
+    python -m benchmarks.playback_engines [--guilds 50] [--seconds 10]
+                                          [--read-cost-ms 0.1] [--workers 1]
+
+Every guild plays a synthetic Opus source on a fake voice client. Jitter
+is the deviation of each packet interval from 20 ms; CPU is process time
+over wall time for the run.
+"""
+import argparse
+import threading
+import time
+from typing import Callable, Dict, List
+from music_bot.core.playback_engine import MultiplexedEngine, VoiceClientEngine
+from .fake_voice import (FRAME_SECONDS, FakeVoiceClient, SyntheticSource, intervals_ms,
+                         percentile, start_loop)
+
+def run(make_engine: Callable[[], object], loop, guilds: int, frames: int, read_cost: float) -> Dict[str, float]:
+    remaining = threading.Semaphore(0)
+    voice_clients: List[FakeVoiceClient] = []
+    threads_before = threading.active_count()
+    engine = make_engine()
+    peak_threads = threading.active_count()
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    for guild_id in range(guilds):
+        voice_client = FakeVoiceClient(loop, guild_id)
+        voice_clients.append(voice_client)
+        engine.play(guild_id, voice_client, SyntheticSource(guild_id, frames, read_cost),
+                    lambda error: remaining.release())
+
+    for _ in range(guilds):
+        while not remaining.acquire(timeout=0.5):
+            peak_threads = max(peak_threads, threading.active_count())
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    # Trailing silence packets are not paced; measure audio frames only
+    jitter = []
+    for voice_client in voice_clients:
+        audio = voice_client.packets[:frames]
+        jitter += [abs(interval - FRAME_SECONDS * 1000) for interval in intervals_ms(audio)]
+
+    return {
+        "wall_s": wall,
+        "cpu_percent": 100 * cpu / wall,
+        "threads": peak_threads - threads_before,
+        "jitter_p50_ms": percentile(jitter, 0.50),
+        "jitter_p99_ms": percentile(jitter, 0.99),
+        "jitter_max_ms": max(jitter) if jitter else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guilds", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--read-cost-ms", type=float, default=0.1,
+                        help="simulated CPU per source read")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="multiplexed engine sender threads")
+    args = parser.parse_args()
+
+    loop = start_loop()
+    frames = int(args.seconds / FRAME_SECONDS)
+    read_cost = args.read_cost_ms / 1000
+    results = {
+        "voice_client": run(VoiceClientEngine, loop, args.guilds, frames, read_cost),
+        "multiplexed": run(lambda: MultiplexedEngine(args.workers), loop, args.guilds, frames, read_cost),
+    }
+
+    print(f"{args.guilds} guilds, {args.seconds:.0f}s each, "
+          f"{args.read_cost_ms} ms per read, {args.workers} sender worker(s)")
+    columns = ["wall_s", "cpu_percent", "threads", "jitter_p50_ms", "jitter_p99_ms", "jitter_max_ms"]
+    print(f"{'engine':<14}" + "".join(f"{column:>15}" for column in columns))
+    for name, result in results.items():
+        print(f"{name:<14}" + "".join(f"{result[column]:>15.2f}" for column in columns))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Measure the audible gap between two tracks with a fake voice client
+
+    python -m benchmarks.track_gap [--spawn-delay 0.3] [--track-seconds 2]
+
+restart            stock behaviour: the next track's source is spawned and
+                   played from the previous track's after callback
+gapless_preloaded  GaplessAudioSource preloading ahead of the known end
+gapless_late       GaplessAudioSource with an unknown duration, so the next
+                   source only starts when the current one ends
+"""
+import argparse
+import threading
+import time
+from typing import Dict
+from music_bot.config.setting import PlaybackConfig
+from music_bot.core.music_player import GaplessAudioSource
+from music_bot.models.music import Track
+from .fake_voice import (FRAME_SECONDS, FakeVoiceClient, SyntheticSource, frame_tag,
+                         intervals_ms, start_loop)
+
+def make_track(tag: int, duration: int) -> Track:
+    return Track(title=f"track-{tag}", url=f"synthetic://{tag}", duration=duration,
+                 track_id=f"synthetic:{tag}")
+
+def measure(voice_client: FakeVoiceClient) -> Dict[str, float]:
+    packets = voice_client.packets
+    last_a = max(sent for sent, data in packets if frame_tag(data) == 1)
+    first_b = min(sent for sent, data in packets if frame_tag(data) == 2)
+    silence = sum(1 for sent, data in packets
+                  if frame_tag(data) is None and last_a < sent < first_b)
+    return {
+        "gap_ms": (first_b - last_a - FRAME_SECONDS) * 1000,
+        "silence_frames": silence,
+        "max_interval_ms": max(intervals_ms(packets)),
+    }
+
+def run_restart(loop, frames: int, spawn_delay: float) -> Dict[str, float]:
+    voice_client = FakeVoiceClient(loop)
+    done = threading.Event()
+
+    def start_next(error):
+        time.sleep(spawn_delay)
+        voice_client.play(SyntheticSource(2, frames), after=lambda error: done.set())
+
+    voice_client.play(SyntheticSource(1, frames),
+                      after=lambda error: threading.Thread(target=start_next, args=(error,)).start())
+    done.wait()
+    return measure(voice_client)
+
+def run_gapless(loop, frames: int, spawn_delay: float, known_duration: bool) -> Dict[str, float]:
+    voice_client = FakeVoiceClient(loop)
+    done = threading.Event()
+    duration = int(frames * FRAME_SECONDS) if known_duration else 0
+    queue = [(2, make_track(2, duration))]
+
+    def next_source():
+        if not queue:
+            return None
+        tag, track = queue.pop(0)
+        time.sleep(spawn_delay)
+        return SyntheticSource(tag, frames), track
+
+    config = PlaybackConfig(preload_seconds=1.0, prebuffer_frames=10)
+    source = GaplessAudioSource(SyntheticSource(1, frames), make_track(1, duration),
+                                next_source, config)
+    voice_client.play(source, after=lambda error: done.set())
+    done.wait()
+    return measure(voice_client)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--spawn-delay", type=float, default=0.3,
+                        help="simulated ffmpeg spawn and first-read latency in seconds")
+    parser.add_argument("--track-seconds", type=int, default=2)
+    args = parser.parse_args()
+
+    loop = start_loop()
+    frames = int(args.track_seconds / FRAME_SECONDS)
+    results = {
+        "restart": run_restart(loop, frames, args.spawn_delay),
+        "gapless_preloaded": run_gapless(loop, frames, args.spawn_delay, known_duration=True),
+        "gapless_late": run_gapless(loop, frames, args.spawn_delay, known_duration=False),
+    }
+
+    print(f"spawn delay {args.spawn_delay * 1000:.0f} ms, {args.track_seconds}s tracks")
+    print(f"{'scenario':<20}{'gap ms':>10}{'silence':>10}{'max interval ms':>18}")
+    for name, result in results.items():
+        print(f"{name:<20}{result['gap_ms']:>10.1f}{result['silence_frames']:>10}"
+              f"{result['max_interval_ms']:>18.1f}")
+
+if __name__ == "__main__":
+    main()
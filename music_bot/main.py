@@ -1,4 +1,5 @@
 import asyncio
+import signal
 import threading
 import sys
 import os
@@ -7,22 +8,52 @@ import os
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
+from music_bot.utils.startup import startup_timer
 from music_bot.config.setting import Settings
-from music_bot.core.bot import MusicBot
-from music_bot.api.server import create_app, run_server
-from music_bot.utils.logger import setup_logger
+from music_bot.utils.logger import (
+    route_library_logger, setup_logger, set_log_level, set_sample_rate
+)
+from music_bot.api.server import BotHandle, create_app, run_server
+startup_timer.mark("import_api")
 
 logger = setup_logger(__name__)
 
 def main():
     """Main entry point"""
+    # Exit once ready and report startup milestones instead of serving
+    benchmark = "--startup-benchmark" in sys.argv
+
     try:
         # Load settings
         settings = Settings.load()
         logger.info("Settings loaded successfully")
 
+        # discord.run(log_handler=None) leaves discord.py logging unconfigured
+        route_library_logger("discord")
+
+        # Apply logging settings to every configured logger
+        set_log_level(settings.logging.level)
+        for key, every in settings.logging.sample_rates.items():
+            set_sample_rate(key, every)
+
+        # Serve the API (health first) before discord.py is even imported
+        bot_handle = BotHandle()
+        app = create_app(bot_handle)
+        api_thread = threading.Thread(
+            target=run_server,
+            args=(app, settings),
+            daemon=True,
+            name="FastAPI-Thread"
+        )
+        api_thread.start()
+        logger.info("FastAPI server started on background thread")
+
+        from music_bot.core.bot import MusicBot
+        startup_timer.mark("import_bot")
+
         # Create music bot
         music_bot = MusicBot(settings)
+        startup_timer.mark("bot_created")
         logger.info("Music bot created")
 
         # Store bot's loop reference for cross-thread access
@@ -37,33 +68,40 @@ def main():
             async def on_ready():
                 # Store the bot's event loop
                 music_bot._bot_loop = asyncio.get_event_loop()
-                logger.info(f'{music_bot.user} connected to Discord!')
-                logger.info(f'Bot is in {len(music_bot.guilds)} guilds')
+                startup_timer.mark("discord_ready")
+                logger.info('%s connected to Discord!', music_bot.user)
+                logger.info('Bot is in %d guilds', len(music_bot.guilds))
                 logger.info("Bot event loop stored for API access")
 
-        music_bot._setup_events = setup_events_with_loop
-        music_bot._setup_events()
+                # SIGTERM drains instead of killing playback mid-track
+                music_bot._bot_loop.add_signal_handler(
+                    signal.SIGTERM,
+                    lambda: music_bot.drain_controller.start_drain("SIGTERM")
+                )
 
-        # Create FastAPI app
-        app = create_app(music_bot)
-        logger.info("FastAPI app created")
+                if settings.drain.resume_on_start and not benchmark:
+                    asyncio.ensure_future(music_bot.drain_controller.resume())
 
-        # Start API server in background thread
-        api_thread = threading.Thread(
-            target=run_server,
-            args=(app, settings),
-            daemon=True,
-            name="FastAPI-Thread"
-        )
-        api_thread.start()
-        logger.info("FastAPI server started on background thread")
+                # Build the extraction engine off the critical path
+                asyncio.ensure_future(warm_up_extraction())
+
+            async def warm_up_extraction():
+                await music_bot.youtube_service.warm_up()
+                startup_timer.mark("extraction_ready")
+                logger.info("Startup timings (ms): %s", startup_timer.report())
+                if benchmark:
+                    await music_bot.close()
+
+        music_bot._setup_events = setup_events_with_loop
+        music_bot._setup_events()
+        bot_handle.attach(music_bot)
 
         # Start Discord bot (blocking)
         logger.info("Starting Discord bot...")
         music_bot.run(settings.discord.token, log_handler=None)
 
     except Exception as e:
-        logger.error(f"Failed to start application: {e}")
+        logger.error("Failed to start application: %s", e)
         raise
 
 if __name__ == "__main__":
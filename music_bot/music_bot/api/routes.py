@@ -1,8 +1,16 @@
 import asyncio
-from fastapi import APIRouter, HTTPException
+import hmac
+import ipaddress
+import json
+import time
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import Optional
-from ..utils.logger import setup_logger
+from typing import Callable, Dict, Optional, Tuple
+from ..utils.exceptions import CircuitOpenError
+from ..utils.logger import setup_logger, set_log_level, get_logging_stats
+from ..utils.startup import startup_timer
+from ..utils.tracing import current_trace
 
 logger = setup_logger(__name__)
 
@@ -15,12 +23,16 @@ class PlayRequest(BaseModel):
 class ControlRequest(BaseModel):
     guild_id: int
 
+class LogLevelRequest(BaseModel):
+    level: str
+    logger: Optional[str] = None
+
 def create_music_routes(music_bot):
     """Create music API routes with thread-safe execution"""
     router = APIRouter()
 
-    def execute_in_bot_loop(coro):
-        """Execute coroutine in bot's event loop thread-safely"""
+    async def execute_in_bot_loop(coro):
+        """Execute coroutine in bot's event loop without blocking the API loop"""
         try:
             # Wait for bot to be ready and loop to be available
             max_wait = 30  # 30 seconds max wait
@@ -28,32 +40,91 @@ def create_music_routes(music_bot):
 
             while not hasattr(music_bot, '_bot_loop') or music_bot._bot_loop is None:
                 if wait_count >= max_wait * 10:  # 100ms intervals
+                    coro.close()
                     raise HTTPException(
                         status_code=503,
                         detail="Bot not ready - no event loop available"
                     )
-                import time
-                time.sleep(0.1)
+                await asyncio.sleep(0.1)
                 wait_count += 1
 
-            # Execute in bot's event loop
-            future = asyncio.run_coroutine_threadsafe(coro, music_bot._bot_loop)
-            return future.result(timeout=30)
+            # Execute in bot's event loop; the current trace context travels with it
+            future = asyncio.run_coroutine_threadsafe(
+                _traced(coro, time.monotonic()),
+                music_bot._bot_loop
+            )
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(future), timeout=30)
+            except asyncio.TimeoutError:
+                future.cancel()
+                raise
 
+        except HTTPException:
+            raise
         except asyncio.TimeoutError:
             raise HTTPException(status_code=408, detail="Request timeout")
+        except CircuitOpenError:
+            raise
         except Exception as e:
-            logger.error(f"Error executing in bot loop: {e}")
+            logger.error("Error executing in bot loop: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
 
+    async def _traced(coro, queued_at: float):
+        """Record how long the coroutine waited for the bot loop"""
+        trace = current_trace.get()
+        if trace is not None:
+            trace.add_span("bot_loop_wait", queued_at, time.monotonic())
+        return await coro
+
+    def require_admin(request: Request, x_admin_token: Optional[str] = Header(None)):
+        """Admin routes need the shared token, or a loopback client when none is set"""
+        token = music_bot.settings.api.admin_token
+        if token:
+            if x_admin_token and hmac.compare_digest(x_admin_token.encode(), token.encode()):
+                return
+            raise HTTPException(status_code=401, detail="Invalid or missing admin token")
+
+        try:
+            loopback = ipaddress.ip_address(request.client.host).is_loopback
+        except (AttributeError, ValueError):
+            loopback = False
+        if not loopback:
+            raise HTTPException(status_code=403, detail="Admin routes are loopback-only")
+
+    def service_unavailable(error: str, retry_after: float) -> JSONResponse:
+        """503 in the Go client's response shape, with a retry hint"""
+        return JSONResponse(
+            status_code=503,
+            content={"success": False, "title": "", "error": error},
+            headers={"Retry-After": str(max(1, int(retry_after + 0.5)))}
+        )
+
+    def draining_response() -> Optional[JSONResponse]:
+        """Refuse new playback while draining so clients retry elsewhere"""
+        if music_bot.drain_controller.draining:
+            return service_unavailable("Server is draining",
+                                       music_bot.drain_controller.config.retry_after)
+        return None
+
     @router.post("/play")
-    async def play_music(request: PlayRequest):
+    async def play_music(
+        request: PlayRequest,
+        response: Response,
+        x_request_id: Optional[str] = Header(None)
+    ):
         """Play music"""
+        rejection = draining_response()
+        if rejection is not None:
+            return rejection
+        trace = music_bot.tracer.start("play", x_request_id)
+        trace.attributes["guild_id"] = request.guild_id
+        response.headers["X-Request-ID"] = trace.request_id
         try:
-            logger.info(f"Play request: {request.dict()}")
+            logger.info("Play request: url=%s user_id=%s", request.url, request.user_id,
+                        extra={"guild_id": request.guild_id})
 
             # Execute in bot's event loop
-            track = execute_in_bot_loop(
+            track = await execute_in_bot_loop(
                 music_bot.play_music(
                     request.guild_id,
                     request.channel_id,
@@ -62,7 +133,9 @@ def create_music_routes(music_bot):
                 )
             )
 
-            logger.info(f"Successfully started playing: {track.title}")
+            trace.event("api_response")
+            logger.info("Successfully started playing: %s", track.title,
+                        extra={"guild_id": request.guild_id, "track_id": track.track_id})
 
             # Return JSON response for Go client
             return {
@@ -71,28 +144,70 @@ def create_music_routes(music_bot):
                 "error": ""
             }
 
-        except HTTPException:
+        except HTTPException as e:
+            trace.finish(e)
             raise
+        except CircuitOpenError as e:
+            trace.finish(e)
+            return service_unavailable(str(e), e.retry_after)
         except Exception as e:
-            logger.error(f"Play error: {e}")
+            trace.finish(e)
+            logger.error("Play error: %s", e, extra={"guild_id": request.guild_id})
             return {
                 "success": False,
                 "title": "",
                 "error": f"Failed to play music: {str(e)}"
             }
 
+    @router.post("/queue")
+    async def queue_music(request: PlayRequest):
+        """Queue music to play after the current track"""
+        rejection = draining_response()
+        if rejection is not None:
+            return rejection
+        try:
+            logger.info("Queue request: url=%s user_id=%s", request.url, request.user_id,
+                        extra={"guild_id": request.guild_id})
+
+            track = await execute_in_bot_loop(
+                music_bot.queue_music(
+                    request.guild_id,
+                    request.channel_id,
+                    request.url,
+                    request.user_id
+                )
+            )
+
+            return {
+                "success": True,
+                "title": track.title,
+                "error": ""
+            }
+
+        except HTTPException:
+            raise
+        except CircuitOpenError as e:
+            return service_unavailable(str(e), e.retry_after)
+        except Exception as e:
+            logger.error("Queue error: %s", e, extra={"guild_id": request.guild_id})
+            return {
+                "success": False,
+                "title": "",
+                "error": f"Failed to queue music: {str(e)}"
+            }
+
     @router.post("/stop")
     async def stop_music(request: ControlRequest):
         """Stop music"""
         try:
-            logger.info(f"Stop request: guild_id={request.guild_id}")
+            logger.info("Stop request", extra={"guild_id": request.guild_id})
 
             # Get current track info before stopping
             status = music_bot.get_status(request.guild_id)
             current_track = status.get("playback_state", {}).get("current_track")
             track_title = current_track.get("title", "Unknown") if current_track else "No track"
 
-            stopped = execute_in_bot_loop(
+            stopped = await execute_in_bot_loop(
                 music_bot.stop_music(request.guild_id)
             )
 
@@ -112,7 +227,7 @@ def create_music_routes(music_bot):
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Stop error: {e}")
+            logger.error("Stop error: %s", e, extra={"guild_id": request.guild_id})
             return {
                 "success": False,
                 "title": "",
@@ -123,14 +238,14 @@ def create_music_routes(music_bot):
     async def pause_music(request: ControlRequest):
         """Pause music"""
         try:
-            logger.info(f"Pause request: guild_id={request.guild_id}")
+            logger.info("Pause request", extra={"guild_id": request.guild_id})
 
             # Get current track info
             status = music_bot.get_status(request.guild_id)
             current_track = status.get("playback_state", {}).get("current_track")
             track_title = current_track.get("title", "Unknown") if current_track else "No track"
 
-            paused = execute_in_bot_loop(
+            paused = await execute_in_bot_loop(
                 music_bot.pause_music(request.guild_id)
             )
 
@@ -142,21 +257,21 @@ def create_music_routes(music_bot):
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Pause error: {e}")
+            logger.error("Pause error: %s", e, extra={"guild_id": request.guild_id})
             raise HTTPException(status_code=500, detail=f"Failed to pause music: {str(e)}")
 
     @router.post("/resume")
     async def resume_music(request: ControlRequest):
         """Resume music"""
         try:
-            logger.info(f"Resume request: guild_id={request.guild_id}")
+            logger.info("Resume request", extra={"guild_id": request.guild_id})
 
             # Get current track info
             status = music_bot.get_status(request.guild_id)
             current_track = status.get("playback_state", {}).get("current_track")
             track_title = current_track.get("title", "Unknown") if current_track else "No track"
 
-            resumed = execute_in_bot_loop(
+            resumed = await execute_in_bot_loop(
                 music_bot.resume_music(request.guild_id)
             )
 
@@ -168,16 +283,16 @@ def create_music_routes(music_bot):
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Resume error: {e}")
+            logger.error("Resume error: %s", e, extra={"guild_id": request.guild_id})
             raise HTTPException(status_code=500, detail=f"Failed to resume music: {str(e)}")
 
     @router.post("/leave")
     async def leave_channel(request: ControlRequest):
         """Leave voice channel"""
         try:
-            logger.info(f"Leave request: guild_id={request.guild_id}")
+            logger.info("Leave request", extra={"guild_id": request.guild_id})
 
-            left = execute_in_bot_loop(
+            left = await execute_in_bot_loop(
                 music_bot.leave_channel(request.guild_id)
             )
 
@@ -189,34 +304,119 @@ def create_music_routes(music_bot):
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Leave error: {e}")
+            logger.error("Leave error: %s", e, extra={"guild_id": request.guild_id})
             raise HTTPException(status_code=500, detail=f"Failed to leave channel: {str(e)}")
 
+    # Pre-serialized bodies keyed by (route, guild), valid for one state version
+    response_cache: Dict[Tuple[str, int], Tuple[int, bytes]] = {}
+
+    def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+    async def versioned_response(
+        kind: str,
+        guild_id: int,
+        build: Callable[[int], dict],
+        if_none_match: Optional[str],
+        wait_for_version: Optional[int],
+        timeout: float
+    ) -> Response:
+        """Serve a cached body for the guild's state version with ETag/304 support
+
+        With wait_for_version the request is held until the guild reaches
+        that version or the timeout passes, whichever comes first.
+        """
+        versions = music_bot.state_versions
+        if wait_for_version is not None:
+            timeout = min(max(timeout, 0), music_bot.settings.api.max_long_poll_seconds)
+            version = await versions.wait_for(guild_id, wait_for_version, timeout)
+        else:
+            version = versions.get(guild_id)
+
+        etag = versions.etag(guild_id, version)
+        headers = {"ETag": etag, "X-State-Version": str(version), "Cache-Control": "no-cache"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        cached = response_cache.get((kind, guild_id))
+        if cached is not None and cached[0] == version:
+            body = cached[1]
+        else:
+            body = json.dumps(build(version)).encode()
+            response_cache[(kind, guild_id)] = (version, body)
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def build_status(guild_id: int, version: int) -> dict:
+        status = music_bot.get_status(guild_id)
+
+        # Add more detailed current track info
+        if status.get("playback_state", {}).get("current_track"):
+            current_track = status["playback_state"]["current_track"]
+            status["now_playing"] = {
+                "title": current_track.get("title", "Unknown"),
+                "uploader": current_track.get("uploader", "Unknown"),
+                "duration": current_track.get("duration", 0),
+                "formatted_duration": format_duration(current_track.get("duration", 0))
+            }
+        else:
+            status["now_playing"] = None
+
+        # Position is as of this snapshot; it does not bump the version
+        status["version"] = version
+        status["snapshot_at"] = time.time()
+        return status
+
+    def build_now_playing(guild_id: int, version: int) -> dict:
+        status = music_bot.get_status(guild_id)
+        playback_state = status.get("playback_state", {})
+        current_track = playback_state.get("current_track")
+
+        if not current_track:
+            return {
+                "playing": False,
+                "version": version,
+                "message": "No music currently playing"
+            }
+
+        return {
+            "playing": True,
+            "version": version,
+            "status": playback_state.get("status", "unknown"),
+            "track": {
+                "title": current_track.get("title", "Unknown"),
+                "uploader": current_track.get("uploader", "Unknown"),
+                "duration": current_track.get("duration", 0),
+                "formatted_duration": format_duration(current_track.get("duration", 0)),
+                "requester_id": current_track.get("requester_id")
+            },
+            "message": f"Now playing: {current_track.get('title', 'Unknown')}"
+        }
+
     @router.get("/status/{guild_id}")
-    async def get_status(guild_id: int):
+    async def get_status(
+        guild_id: int,
+        wait_for_version: Optional[int] = None,
+        timeout: float = 25.0,
+        if_none_match: Optional[str] = Header(None)
+    ):
         """Get bot status with current playing track"""
         try:
-            logger.info(f"Status request: guild_id={guild_id}")
+            logger.debug("Status request", extra={"guild_id": guild_id, "sample": "status_poll"})
 
             # This method doesn't use async Discord operations
-            status = music_bot.get_status(guild_id)
-
-            # Add more detailed current track info
-            if status.get("playback_state", {}).get("current_track"):
-                current_track = status["playback_state"]["current_track"]
-                status["now_playing"] = {
-                    "title": current_track.get("title", "Unknown"),
-                    "uploader": current_track.get("uploader", "Unknown"),
-                    "duration": current_track.get("duration", 0),
-                    "formatted_duration": format_duration(current_track.get("duration", 0))
-                }
-            else:
-                status["now_playing"] = None
-
-            return status
+            return await versioned_response(
+                "status", guild_id, lambda version: build_status(guild_id, version),
+                if_none_match, wait_for_version, timeout
+            )
 
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"Status error: {e}")
+            logger.error("Status error: %s", e, extra={"guild_id": guild_id})
             raise HTTPException(status_code=500, detail=f"Failed to get status: {str(e)}")
 
     def format_duration(seconds):
@@ -229,44 +429,108 @@ def create_music_routes(music_bot):
         return f"{minutes:02d}:{seconds:02d}"
 
     @router.get("/now-playing/{guild_id}")
-    async def now_playing(guild_id: int):
+    async def now_playing(
+        guild_id: int,
+        wait_for_version: Optional[int] = None,
+        timeout: float = 25.0,
+        if_none_match: Optional[str] = Header(None)
+    ):
         """Get currently playing track information"""
         try:
-            status = music_bot.get_status(guild_id)
-            playback_state = status.get("playback_state", {})
-            current_track = playback_state.get("current_track")
-
-            if not current_track:
-                return {
-                    "playing": False,
-                    "message": "No music currently playing"
-                }
-
-            return {
-                "playing": True,
-                "status": playback_state.get("status", "unknown"),
-                "track": {
-                    "title": current_track.get("title", "Unknown"),
-                    "uploader": current_track.get("uploader", "Unknown"),
-                    "duration": current_track.get("duration", 0),
-                    "formatted_duration": format_duration(current_track.get("duration", 0)),
-                    "requester_id": current_track.get("requester_id")
-                },
-                "message": f"Now playing: {current_track.get('title', 'Unknown')}"
-            }
+            return await versioned_response(
+                "now_playing", guild_id, lambda version: build_now_playing(guild_id, version),
+                if_none_match, wait_for_version, timeout
+            )
 
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"Now playing error: {e}")
+            logger.error("Now playing error: %s", e, extra={"guild_id": guild_id})
             raise HTTPException(status_code=500, detail=f"Failed to get current track: {str(e)}")
 
     @router.get("/health")
     async def health_check():
         """Health check endpoint"""
+        if not music_bot.started:
+            return {
+                "status": "starting",
+                "live": True,
+                "ready": False,
+                "draining": False,
+                "bot_ready": False,
+                "startup_ms": startup_timer.report()
+            }
+
         bot_ready = hasattr(music_bot, '_bot_loop') and music_bot._bot_loop is not None
+        drain = music_bot.drain_controller
         return {
-            "status": "healthy",
+            "status": "draining" if drain.draining else "healthy",
+            "live": True,
+            "ready": bot_ready and drain.ready,
+            "draining": drain.draining,
             "bot_ready": bot_ready,
-            "bot_user": str(music_bot.user) if music_bot.user else None
+            "bot_user": str(music_bot.user) if music_bot.user else None,
+            "extraction_circuit": music_bot.youtube_service.circuit_breaker.stats(),
+            "startup_ms": startup_timer.report()
         }
 
+    @router.get("/health/live")
+    async def liveness():
+        """Liveness: the process is up and serving HTTP"""
+        return {"live": True}
+
+    @router.get("/health/ready")
+    async def readiness(response: Response):
+        """Readiness: connected to Discord and accepting new playback"""
+        if not music_bot.started:
+            response.status_code = 503
+            return {"ready": False, "draining": False}
+
+        bot_ready = getattr(music_bot, '_bot_loop', None) is not None
+        ready = bot_ready and music_bot.drain_controller.ready
+        if not ready:
+            response.status_code = 503
+        return {"ready": ready, "draining": music_bot.drain_controller.draining}
+
+    @router.post("/admin/drain", dependencies=[Depends(require_admin)])
+    async def start_drain():
+        """Begin a graceful drain (same as SIGTERM)"""
+        if getattr(music_bot, '_bot_loop', None) is None:
+            raise HTTPException(status_code=503, detail="Bot not ready - no event loop available")
+
+        music_bot._bot_loop.call_soon_threadsafe(
+            music_bot.drain_controller.start_drain, "admin endpoint"
+        )
+        return {"success": True, "draining": True}
+
+    @router.get("/debug/resources")
+    async def resource_usage(tracemalloc: bool = False):
+        """Per-guild ffmpeg, voice client and state accounting"""
+        return music_bot.resource_monitor.snapshot(include_tracemalloc=tracemalloc)
+
+    @router.get("/debug/traces")
+    async def slowest_traces():
+        """Slowest recent request traces, API call to first audio frame"""
+        return {"traces": music_bot.tracer.slowest()}
+
+    @router.get("/debug/playback-engine")
+    async def playback_engine_stats():
+        """Audio sender thread and jitter statistics"""
+        return music_bot.music_player.engine.stats()
+
+    @router.get("/debug/logging")
+    async def logging_stats():
+        """Async logging queue statistics"""
+        return get_logging_stats()
+
+    @router.post("/debug/log-level", dependencies=[Depends(require_admin)])
+    async def change_log_level(request: LogLevelRequest):
+        """Change log level at runtime"""
+        try:
+            levels = set_log_level(request.level, request.logger)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        logger.warning("Log level changed: %s", levels)
+        return {"success": True, "levels": levels}
+
     return router
@@ -1,15 +1,50 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Optional
+from fastapi import FastAPI, HTTPException
 import uvicorn
 from music_bot.config.setting import Settings
-from music_bot.core.bot import MusicBot
 from music_bot.api.routes import create_music_routes
+from music_bot.utils.logger import route_library_logger
+from music_bot.utils.startup import startup_timer
 
-def create_app(music_bot: MusicBot) -> FastAPI:
+if TYPE_CHECKING:
+    from music_bot.core.bot import MusicBot
+
+class BotHandle:
+    """Forwards to the MusicBot once it exists, so the API can start before it
+
+    Until attach() is called, routes that touch the bot answer 503.
+    """
+
+    def __init__(self):
+        self.bot: Optional["MusicBot"] = None
+
+    @property
+    def started(self) -> bool:
+        return self.bot is not None
+
+    def attach(self, bot: "MusicBot"):
+        self.bot = bot
+
+    def __getattr__(self, name: str):
+        bot = self.__dict__.get("bot")
+        if bot is None:
+            raise HTTPException(status_code=503, detail="Bot starting",
+                                headers={"Retry-After": "1"})
+        return getattr(bot, name)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    startup_timer.mark("api_listening")
+    yield
+
+def create_app(music_bot: BotHandle) -> FastAPI:
     """Create FastAPI application"""
     app = FastAPI(
         title="Discord Music Bot API",
         version="2.0.0",
-        description="RESTful API for Discord Music Bot"
+        description="RESTful API for Discord Music Bot",
+        lifespan=lifespan
     )
 
     # Include routes
@@ -20,10 +55,14 @@ def create_app(music_bot: MusicBot) -> FastAPI:
 
 def run_server(app: FastAPI, settings: Settings):
     """Run FastAPI server"""
+    # uvicorn's default config writes access lines synchronously to stderr
+    for name in ("uvicorn", "uvicorn.access"):
+        route_library_logger(name, settings.api.log_level)
     uvicorn.run(
         app,
         host=settings.api.host,
         port=settings.api.port,
         log_level=settings.api.log_level,
+        log_config=None,
         access_log=True
     )
@@ -1,6 +1,6 @@
 import os
-from dataclasses import dataclass
-from typing import Dict, Union, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Union, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -24,8 +24,14 @@ class YTDLConfig:
     extractaudio: bool = True
     audioformat: str = 'opus'
     noplaylist: bool = True
+    # Bounds each network read so extractions abandoned on timeout still end
+    socket_timeout: float = 15.0
+    # Extraction threads; a hung upstream cannot take more than these
+    extract_workers: int = 4
+    # yt_dlp.extractor modules to import; ["default"] loads every extractor
+    extractor_modules: List[str] = field(default_factory=lambda: ["youtube"])
 
-    def to_dict(self) -> Dict[str, Union[str, bool]]:
+    def to_dict(self) -> Dict[str, Union[str, bool, float]]:
         return {
             'format': self.format,
             'quiet': self.quiet,
@@ -33,41 +39,180 @@ class YTDLConfig:
             'extractaudio': self.extractaudio,
             'audioformat': self.audioformat,
             'noplaylist': self.noplaylist,
+            'socket_timeout': self.socket_timeout,
         }
 
+@dataclass
+class AudioFormatConfig:
+    """Per-track stream format selection from the extracted format list"""
+    adaptive: bool = True
+    # Used when the voice channel's bitrate is unknown
+    default_bitrate_kbps: int = 64
+    # Under host load, targets drop to this bitrate
+    overload_bitrate_kbps: int = 48
+    # Host load average as a percentage of CPU count
+    cpu_threshold_percent: float = 80.0
+    max_live_ffmpeg: int = 16
+
 @dataclass
 class FFMPEGConfig:
     """FFMPEG configuration"""
     before_options: str = '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5'
-    options: str = '-vn -filter:a "volume=0.25"'
+    options: str = '-vn'
+    volume: float = 0.25
+    # Remux Opus streams without the volume filter or normalization gain,
+    # skipping decode and encode; listeners set volume in their client
+    opus_passthrough: bool = False
 
-    def to_dict(self) -> Dict[str, str]:
+    def to_dict(self, volume: Optional[float] = None) -> Dict[str, str]:
+        volume = self.volume if volume is None else volume
         return {
             'before_options': self.before_options,
-            'options': self.options
+            'options': f'{self.options} -filter:a "volume={volume:.4f}"'
         }
 
+@dataclass
+class LoudnessConfig:
+    """Per-track loudness normalization configuration"""
+    enabled: bool = True
+    index_path: str = "loudness_index.json"
+    # Integrated loudness that plays at FFMPEGConfig.volume unchanged
+    reference_lufs: float = -14.0
+    min_volume: float = 0.05
+    max_volume: float = 1.0
+    workers: int = 1
+    max_pending: int = 32
+    niceness: int = 19
+    analysis_timeout: float = 600.0
+
+@dataclass
+class PlaybackConfig:
+    """Track transition configuration"""
+    crossfade_seconds: float = 0.0
+    preload_seconds: float = 5.0
+    prebuffer_frames: int = 50
+    # Silence is sent while a late next track prepares, up to this long
+    next_source_timeout: float = 20.0
+    # "voice_client" (one AudioPlayer thread per guild) or "multiplexed"
+    engine: str = "voice_client"
+    sender_workers: int = 1
+
+@dataclass
+class CircuitBreakerConfig:
+    """YouTube extraction circuit breaker configuration"""
+    window_size: int = 20
+    min_calls: int = 5
+    failure_rate_threshold: float = 0.5
+    slow_call_seconds: float = 10.0
+    slow_call_rate_threshold: float = 0.8
+    open_seconds: float = 30.0
+    half_open_probes: int = 1
+    timeout_multiplier: float = 1.5
+    min_timeout: float = 5.0
+    max_timeout: float = 25.0
+    cache_size: int = 256
+    cache_ttl: float = 3600.0
+
 @dataclass
 class APIConfig:
     """API server configuration"""
     host: str = "0.0.0.0"
     port: int = 8080
     log_level: str = "info"
+    # Upper bound for ?wait_for_version= long polls on status routes
+    max_long_poll_seconds: float = 30.0
+    # Shared secret for admin routes (X-Admin-Token); unset allows loopback only
+    admin_token: Optional[str] = None
+
+@dataclass
+class LoggingConfig:
+    """Logging configuration"""
+    level: str = "INFO"
+    # Keep one in N records for high-frequency events tagged extra={"sample": key}
+    sample_rates: Dict[str, int] = field(default_factory=lambda: {
+        "voice_state": 20,
+        "status_poll": 10,
+    })
+
+@dataclass
+class TracingConfig:
+    """Request tracing configuration"""
+    keep_slowest: int = 50
+    # OTLP/HTTP JSON traces endpoint, e.g. http://localhost:4318/v1/traces
+    otlp_endpoint: Optional[str] = None
+    service_name: str = "music-bot"
+
+@dataclass
+class ResourceMonitorConfig:
+    """Resource accounting and leak detection configuration"""
+    sample_interval: float = 60.0
+    # Samples a structure must keep growing across before it is flagged
+    growth_window: int = 10
+    growth_threshold: int = 50
+    # Traceback depth for tracemalloc snapshots; 0 disables tracing
+    tracemalloc_frames: int = 0
+
+@dataclass
+class DrainConfig:
+    """Graceful drain and restart configuration"""
+    deadline_seconds: float = 60.0
+    close_concurrency: int = 8
+    close_timeout: float = 10.0
+    retry_after: int = 30
+    state_path: str = "resume_state.json"
+    resume_on_start: bool = True
+    exit_after_drain: bool = True
 
 @dataclass
 class Settings:
     """Application settings"""
     discord: DiscordConfig
     ytdl: YTDLConfig
+    audio_format: AudioFormatConfig
     ffmpeg: FFMPEGConfig
     api: APIConfig
+    circuit_breaker: CircuitBreakerConfig
+    playback: PlaybackConfig
+    logging: LoggingConfig
+    loudness: LoudnessConfig
+    tracing: TracingConfig
+    resources: ResourceMonitorConfig
+    drain: DrainConfig
 
     @classmethod
     def load(cls) -> 'Settings':
         """Load settings from environment"""
         return cls(
             discord=DiscordConfig(token=os.getenv('DISCORD_TOKEN', '')),
-            ytdl=YTDLConfig(),
-            ffmpeg=FFMPEGConfig(),
-            api=APIConfig()
+            ytdl=YTDLConfig(
+                extractor_modules=os.getenv('YTDL_EXTRACTORS', 'youtube').split(','),
+                extract_workers=int(os.getenv('YTDL_EXTRACT_WORKERS', '4'))
+            ),
+            audio_format=AudioFormatConfig(
+                adaptive=os.getenv('AUDIO_FORMAT_ADAPTIVE', '1') != '0',
+                max_live_ffmpeg=int(os.getenv('AUDIO_MAX_LIVE_FFMPEG', '16'))
+            ),
+            ffmpeg=FFMPEGConfig(
+                opus_passthrough=os.getenv('AUDIO_OPUS_PASSTHROUGH', '0') == '1'
+            ),
+            api=APIConfig(admin_token=os.getenv('API_ADMIN_TOKEN') or None),
+            circuit_breaker=CircuitBreakerConfig(),
+            playback=PlaybackConfig(
+                crossfade_seconds=float(os.getenv('CROSSFADE_SECONDS', '0')),
+                engine=os.getenv('PLAYBACK_ENGINE', 'voice_client'),
+                sender_workers=int(os.getenv('AUDIO_SENDER_WORKERS', '1'))
+            ),
+            logging=LoggingConfig(level=os.getenv('LOG_LEVEL', 'INFO')),
+            loudness=LoudnessConfig(
+                enabled=os.getenv('LOUDNESS_NORMALIZATION', '1') != '0',
+                index_path=os.getenv('LOUDNESS_INDEX_PATH', 'loudness_index.json')
+            ),
+            tracing=TracingConfig(otlp_endpoint=os.getenv('OTLP_ENDPOINT') or None),
+            resources=ResourceMonitorConfig(
+                tracemalloc_frames=int(os.getenv('TRACEMALLOC_FRAMES', '0'))
+            ),
+            drain=DrainConfig(
+                deadline_seconds=float(os.getenv('DRAIN_DEADLINE_SECONDS', '60')),
+                state_path=os.getenv('RESUME_STATE_PATH', 'resume_state.json')
+            )
         )
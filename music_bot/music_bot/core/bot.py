@@ -5,9 +5,15 @@ from typing import Optional
 from ..config.setting import Settings
 from ..services.youtube import YouTubeService
 from ..services.voice_manager import VoiceManager
+from ..services.loudness import LoudnessService
+from ..services.resource_monitor import ResourceMonitor
+from ..services.lifecycle import DrainController
 from ..core.music_player import MusicPlayer
+from ..core.playback_engine import create_engine
 from ..models.music import Track
 from ..utils.logger import setup_logger
+from ..utils.tracing import Tracer
+from ..utils.versioning import StateVersions
 
 logger = setup_logger(__name__)
 
@@ -26,16 +32,42 @@ class MusicBot(commands.Bot):
         )
 
         self.settings = settings
+        self.tracer = Tracer(
+            settings.tracing.keep_slowest,
+            settings.tracing.otlp_endpoint,
+            settings.tracing.service_name
+        )
 
         # Initialize services
-        self.youtube_service = YouTubeService(settings.ytdl.to_dict())
-        self.voice_manager = VoiceManager(self)
+        self.youtube_service = YouTubeService(
+            settings.ytdl.to_dict(),
+            settings.circuit_breaker,
+            settings.audio_format,
+            settings.ytdl.extractor_modules,
+            settings.ytdl.extract_workers
+        )
+        self.state_versions = StateVersions()
+        self.voice_manager = VoiceManager(self, self.state_versions)
+        self.loudness_service = None
+        if settings.loudness.enabled:
+            self.loudness_service = LoudnessService(
+                settings.loudness,
+                settings.ffmpeg.before_options
+            )
         self.music_player = MusicPlayer(
             self.voice_manager,
             self.youtube_service,
-            settings.ffmpeg.to_dict()
+            settings.ffmpeg,
+            settings.playback,
+            create_engine(settings.playback.engine, settings.playback.sender_workers),
+            self.loudness_service,
+            self.state_versions
         )
 
+        self.resource_monitor = ResourceMonitor(self, settings.resources)
+        self.resource_monitor.start()
+        self.drain_controller = DrainController(self, settings.drain)
+
         # Setup event handlers
         self._setup_events()
 
@@ -44,24 +76,40 @@ class MusicBot(commands.Bot):
 
         @self.event
         async def on_ready():
-            logger.info(f'{self.user} connected to Discord!')
-            logger.info(f'Bot is in {len(self.guilds)} guilds')
+            logger.info('%s connected to Discord!', self.user)
+            logger.info('Bot is in %d guilds', len(self.guilds))
 
         @self.event
         async def on_voice_state_update(member, before, after):
             """Handle voice state updates"""
             if member == self.user:
+                # Discord moved, disconnected or kicked the bot. The voice client
+                # applies the change on its own task, so bump again once it has.
+                guild_id = member.guild.id
+                self.state_versions.bump(guild_id)
+                await asyncio.sleep(1)
+                if after.channel is None:
+                    self.voice_manager.cleanup_disconnected()
+                self.state_versions.bump(guild_id)
                 return
 
+            logger.debug(
+                "Voice state update: member=%s before=%s after=%s",
+                member.id,
+                before.channel.id if before.channel else None,
+                after.channel.id if after.channel else None,
+                extra={"guild_id": member.guild.id, "sample": "voice_state"}
+            )
+
             # Auto-leave if bot is alone
             if (before.channel and
                 self.user in before.channel.members and
                 len([m for m in before.channel.members if not m.bot]) == 0):
 
                 guild_id = before.channel.guild.id
-                logger.info(f"Bot alone, leaving guild {guild_id}")
+                logger.info("Bot alone, leaving guild %s", guild_id, extra={"guild_id": guild_id})
                 await asyncio.sleep(5)
-                await self.voice_manager.leave_channel(guild_id)
+                await self.leave_channel(guild_id)
 
         @self.event
         async def on_message(message):
@@ -74,12 +122,24 @@ class MusicBot(commands.Bot):
     async def play_music(self, guild_id: int, channel_id: int, url: str,
                         user_id: Optional[str] = None) -> Track:
         """Play music (API method)"""
+        # Fail before joining voice if extraction would be refused
+        self.youtube_service.check_available(url)
+
         # Join channel
         await self.voice_manager.join_channel(channel_id, guild_id)
 
         # Play music
         return await self.music_player.play(guild_id, url, user_id)
 
+    async def queue_music(self, guild_id: int, channel_id: int, url: str,
+                          user_id: Optional[str] = None) -> Track:
+        """Queue music (API method)"""
+        self.youtube_service.check_available(url)
+        if not self.voice_manager.is_connected(guild_id):
+            await self.voice_manager.join_channel(channel_id, guild_id)
+
+        return await self.music_player.enqueue(guild_id, url, user_id)
+
     async def stop_music(self, guild_id: int) -> bool:
         """Stop music (API method)"""
         return self.music_player.stop(guild_id)
@@ -94,6 +154,7 @@ class MusicBot(commands.Bot):
 
     async def leave_channel(self, guild_id: int) -> bool:
         """Leave voice channel (API method)"""
+        self.music_player.release(guild_id)
         return await self.voice_manager.leave_channel(guild_id)
 
     def get_status(self, guild_id: int) -> dict:
@@ -115,5 +176,6 @@ class MusicBot(commands.Bot):
         return {
             "connected": connected,
             "playback_state": playback_state.dict(),
+            "queue": [track.dict() for track in self.music_player.get_queue(guild_id)],
             "voice_connection": voice_connection
         }
@@ -1,14 +1,338 @@
 import discord
 import asyncio
-from typing import Dict, Optional
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from ..config.setting import FFMPEGConfig, PlaybackConfig
+from ..core.playback_engine import OPUS_SILENCE, VoiceClientEngine
 from ..models.music import Track, PlaybackState, PlaybackStatus
+from ..services.loudness import LoudnessService
 from ..services.youtube import YouTubeService
 from ..services.voice_manager import VoiceManager
-from ..utils.exceptions import PlaybackError
+from ..utils.exceptions import PlaybackError, CircuitOpenError
 from ..utils.logger import setup_logger
+from ..utils.tracing import current_trace, trace_span
+from ..utils.versioning import StateVersions
 
 logger = setup_logger(__name__)
 
+FRAMES_PER_SECOND = 50  # discord.py reads one 20ms frame per AudioSource.read()
+
+NextSourceProvider = Callable[[], Optional[Tuple[discord.AudioSource, Track]]]
+
+def mix_pcm_frames(outgoing: bytes, incoming: bytes, start: float, end: float) -> bytes:
+    """Equal-gain crossfade of two s16le PCM frames, ramping incoming from start to end"""
+    import numpy as np
+
+    size = max(len(outgoing), len(incoming))
+    a = np.zeros(size // 2, dtype=np.float32)
+    b = np.zeros(size // 2, dtype=np.float32)
+    a[:len(outgoing) // 2] = np.frombuffer(outgoing, dtype=np.int16)
+    b[:len(incoming) // 2] = np.frombuffer(incoming, dtype=np.int16)
+
+    # Interleaved stereo: ramp per sample pair so both channels share a gain
+    ramp = np.repeat(np.linspace(start, end, a.size // 2, endpoint=False, dtype=np.float32), 2)
+    mixed = a * (1.0 - ramp) + b * ramp
+    return np.clip(mixed, -32768, 32767).astype(np.int16).tobytes()
+
+class _PreparedSource:
+    """Next source opened ahead of time with a few frames already buffered"""
+
+    def __init__(self):
+        self.source: Optional[discord.AudioSource] = None
+        self.track: Optional[Track] = None
+        self.buffer: Deque[bytes] = deque()
+        self.ready = threading.Event()
+        self.discarded = False
+        self.played = False
+        self.on_first_read: Optional[Callable[[], None]] = None
+        # Set for tracks popped from the guild queue; hands them back if superseded
+        self.on_requeue: Optional[Callable[[Track], None]] = None
+        self._requeue = False
+        self._lock = threading.Lock()
+
+    def prefetch(self, frames: int):
+        for _ in range(frames):
+            data = self.source.read()
+            if not data:
+                break
+            self.buffer.append(data)
+
+    def read(self) -> bytes:
+        data = self.buffer.popleft() if self.buffer else self.source.read()
+        if data:
+            self.played = True
+        if data and self.on_first_read:
+            callback, self.on_first_read = self.on_first_read, None
+            callback()
+        return data
+
+    def finish(self):
+        """Mark preparation done, releasing the source if it was discarded meanwhile"""
+        with self._lock:
+            self.ready.set()
+            discarded = self.discarded
+            requeue = self._requeue
+        if discarded:
+            self.cleanup()
+        if requeue and self.track:
+            self.on_requeue(self.track)
+
+    def supersede(self):
+        """Discard a source that will not play, returning an unplayed queued track"""
+        with self._lock:
+            self._requeue = self.on_requeue is not None and not self.played
+            ready = self.ready.is_set()
+        self.discard()
+        # Still preparing: finish() requeues once the track is known
+        if ready and self._requeue and self.track:
+            self.on_requeue(self.track)
+
+    def discard(self):
+        """Release the source now, or once preparation finishes"""
+        with self._lock:
+            self.discarded = True
+            ready = self.ready.is_set()
+        if ready:
+            self.cleanup()
+
+    def cleanup(self):
+        source, self.source = self.source, None
+        if source:
+            source.cleanup()
+
+class GaplessAudioSource(discord.AudioSource):
+    """AudioSource that preloads the next track and switches on a frame boundary
+
+    Reads happen on a sender thread and never wait: the next source is opened
+    and prebuffered on a helper thread, and silence is returned while a track
+    that could not be preloaded is still starting.
+    With a crossfade configured all sources must be PCM so frames can be mixed.
+    """
+
+    def __init__(
+        self,
+        source: discord.AudioSource,
+        track: Track,
+        next_provider: NextSourceProvider,
+        config: PlaybackConfig,
+        on_track_change: Optional[Callable[[Track], None]] = None,
+        on_first_frame: Optional[Callable[[], None]] = None,
+        start_position: float = 0,
+        requeue: Optional[Callable[[Track], None]] = None
+    ):
+        self.track = track
+        self.next_provider = next_provider
+        self.requeue = requeue
+        self.on_track_change = on_track_change
+        self.crossfade_frames = int(config.crossfade_seconds * FRAMES_PER_SECOND)
+        self.preload_frames = int(config.preload_seconds * FRAMES_PER_SECOND)
+        self.prebuffer_frames = config.prebuffer_frames
+        self.next_source_timeout = config.next_source_timeout
+        self.frames_read = int(start_position * FRAMES_PER_SECOND)
+
+        self._opus = source.is_opus()
+        self._silence = OPUS_SILENCE if self._opus else b'\x00' * discord.opus.Encoder.FRAME_SIZE
+        self._ended_at: Optional[float] = None
+        self._current = _PreparedSource()
+        self._current.source = source
+        self._current.track = track
+        self._current.on_first_read = on_first_frame
+        self._current.ready.set()
+        self._next: Optional[_PreparedSource] = None
+        self._preload_attempted = False
+        self._switch_now = False
+        self._fade_pos: Optional[int] = None
+
+        # Only _pending is written from outside the player thread
+        self._pending: Optional[_PreparedSource] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def position(self) -> float:
+        """Seconds played of the current track"""
+        return self.frames_read / FRAMES_PER_SECOND
+
+    def is_opus(self) -> bool:
+        return self._opus
+
+    def process_ids(self) -> List[int]:
+        """PIDs of the ffmpeg processes behind the current and next sources"""
+        pids = []
+        for prepared in (self._current, self._next, self._pending):
+            process = getattr(prepared.source, "_process", None) if prepared else None
+            if process is not None:
+                pids.append(process.pid)
+        return pids
+
+    def buffered_frames(self) -> Dict[str, int]:
+        """Frames held in prefetch buffers"""
+        nxt = self._next
+        return {
+            "current": len(self._current.buffer),
+            "next": len(nxt.buffer) if nxt else 0
+        }
+
+    def next_track(self) -> Optional[Track]:
+        """Track already taken from the queue and preloaded to play next"""
+        nxt = self._next
+        if nxt is None or nxt.discarded:
+            return None
+        return nxt.track
+
+    def switch_to(self, source: discord.AudioSource, track: Track,
+                  on_first_frame: Optional[Callable[[], None]] = None):
+        """Replace the current track as soon as the new source is buffered"""
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                prepared = self._start_prepare(lambda: (source, track))
+                prepared.on_first_read = on_first_frame
+                previous, self._pending = self._pending, prepared
+        if closed:
+            # Playback already ended; nothing will ever read the new source
+            source.cleanup()
+            return
+        if previous:
+            previous.discard()
+
+    def read(self) -> bytes:
+        self._take_pending()
+        self._maybe_preload()
+
+        nxt = self._next
+        if nxt and nxt.ready.is_set() and self._fade_pos is None and self._ended_at is None:
+            if nxt.source is None:
+                self._next = None
+            elif self._switch_now or (self.crossfade_frames and self._near_end(self.crossfade_frames)):
+                if self.crossfade_frames and not self._opus:
+                    self._fade_pos = 0
+                else:
+                    self._advance()
+
+        data = self._current.read()
+
+        if self._fade_pos is not None:
+            incoming = self._next.read()
+            if not data:
+                # Outgoing track ended mid-fade
+                self._advance()
+                data = incoming
+            elif not incoming:
+                self._next.supersede()
+                self._next = None
+                self._fade_pos = None
+            else:
+                start = self._fade_pos / self.crossfade_frames
+                end = (self._fade_pos + 1) / self.crossfade_frames
+                data = mix_pcm_frames(data, incoming, start, end)
+                self._fade_pos += 1
+                if self._fade_pos >= self.crossfade_frames:
+                    self._advance()
+                    self.frames_read = self.crossfade_frames - 1
+        elif not data:
+            # Current source ended before a transition began
+            now = time.monotonic()
+            if self._ended_at is None:
+                self._ended_at = now
+            if self._next is None:
+                self._next = self._start_prepare(self.next_provider)
+            if not self._next.ready.is_set():
+                # Blocking here would stall the sender, then burst to catch up
+                if now - self._ended_at < self.next_source_timeout:
+                    return self._silence
+                logger.warning("Next track not ready after %.0fs, ending playback",
+                               self.next_source_timeout)
+                self._next.discard()
+                self._next = None
+                return b''
+            if self._next.source is None:
+                self._next = None
+                return b''
+            self._advance()
+            data = self._current.read()
+
+        if data:
+            self.frames_read += 1
+        return data
+
+    def cleanup(self):
+        with self._lock:
+            self._closed = True
+            pending, self._pending = self._pending, None
+        for prepared in (self._current, self._next, pending):
+            if prepared:
+                prepared.discard()
+
+    def _take_pending(self):
+        """Adopt a switch requested from another thread"""
+        if self._pending is None:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if self._next:
+            self._next.supersede()
+        self._next = pending
+        self._switch_now = True
+        self._fade_pos = None
+
+    def _near_end(self, frames: int) -> bool:
+        """Whether the current track is within `frames` of its expected end"""
+        total = self.track.duration * FRAMES_PER_SECOND
+        return total > 0 and total - self.frames_read <= frames
+
+    def _maybe_preload(self):
+        if self._next is not None or self._preload_attempted:
+            return
+        if self._near_end(max(self.preload_frames, self.crossfade_frames)):
+            self._preload_attempted = True
+            self._next = self._start_prepare(self.next_provider)
+
+    def _start_prepare(self, provider: NextSourceProvider) -> _PreparedSource:
+        """Open and prebuffer the next source on a helper thread"""
+        prepared = _PreparedSource()
+        if self._closed:
+            prepared.ready.set()
+            return prepared
+        if provider is self.next_provider:
+            prepared.on_requeue = self.requeue
+
+        def run():
+            try:
+                result = provider()
+                if result:
+                    prepared.source, prepared.track = result
+                    prepared.prefetch(self.prebuffer_frames)
+            except Exception as e:
+                logger.error("Failed to preload next source: %s", e)
+                prepared.cleanup()
+            finally:
+                if self._closed:
+                    prepared.discarded = True
+                prepared.finish()
+
+        threading.Thread(target=run, daemon=True, name="AudioPreload").start()
+        return prepared
+
+    def _advance(self):
+        """Make the prepared source current, releasing the previous one"""
+        previous = self._current
+        self._current, self._next = self._next, None
+        self._preload_attempted = False
+        self._switch_now = False
+        self._fade_pos = None
+        self._ended_at = None
+        self.track = self._current.track
+        self.frames_read = 0
+        previous.discard()
+
+        logger.info("Switched to '%s'", self.track.title,
+                    extra={"track_id": self.track.track_id})
+        if self.on_track_change:
+            self.on_track_change(self.track)
+
 class MusicPlayer:
     """Music playback management"""
 
@@ -16,15 +340,26 @@ class MusicPlayer:
         self,
         voice_manager: VoiceManager,
         youtube_service: YouTubeService,
-        ffmpeg_options: Dict[str, str]
+        ffmpeg_config: FFMPEGConfig,
+        playback_config: Optional[PlaybackConfig] = None,
+        engine=None,
+        loudness: Optional[LoudnessService] = None,
+        versions: Optional[StateVersions] = None
     ):
         self.voice_manager = voice_manager
         self.youtube_service = youtube_service
-        self.ffmpeg_options = ffmpeg_options
+        self.ffmpeg_config = ffmpeg_config
+        self.loudness = loudness
+        self.versions = versions or StateVersions()
+        self.playback_config = playback_config or PlaybackConfig()
+        self.engine = engine or VoiceClientEngine()
         self.playback_states: Dict[int, PlaybackState] = {}
+        self.sources: Dict[int, GaplessAudioSource] = {}
+        self.queues: Dict[int, Deque[Track]] = {}
 
-    async def play(self, guild_id: int, url: str, requester_id: Optional[str] = None) -> Track:
-        """Play music from URL"""
+    async def play(self, guild_id: int, url: str, requester_id: Optional[str] = None,
+                   start_at: float = 0) -> Track:
+        """Play music from URL, optionally seeking to start_at seconds"""
         try:
             # Check voice connection
             voice_client = self.voice_manager.get_voice_client(guild_id)
@@ -32,85 +367,271 @@ class MusicPlayer:
                 raise PlaybackError("Not connected to voice channel")
 
             # Extract track information
-            track = await self.youtube_service.extract_track_info(url, requester_id)
+            track = await self.youtube_service.extract_track_info(
+                url, requester_id, *self._format_hints(voice_client)
+            )
+            if self.loudness and not self._passthrough(track):
+                self.loudness.schedule(track)
+
+            # Switch without restarting the player when our source is already live
+            current_source = self.sources.get(guild_id)
+            if (self.engine.is_playing(guild_id, voice_client)
+                    and self.engine.get_source(guild_id, voice_client) is current_source):
+                with trace_span("ffmpeg_spawn"):
+                    source = self._create_source(track, start_at)
+                current_source.switch_to(source, track, self._first_frame_callback())
+                logger.info("Switching to '%s' in guild %s", track.title, guild_id,
+                            extra={"guild_id": guild_id, "track_id": track.track_id})
+                return track
 
             # Stop current playback
-            if voice_client.is_playing() or voice_client.is_paused():
-                voice_client.stop()
+            if self._is_active(guild_id, voice_client):
+                self.engine.stop(guild_id, voice_client)
                 await asyncio.sleep(0.1)
 
-            # Create audio source
-            audio_source = discord.FFmpegOpusAudio(track.url, **self.ffmpeg_options)
+            self._start(guild_id, voice_client, track, start_at)
 
-            # Setup playback callback
-            def after_playing(error: Optional[Exception]):
-                if error:
-                    logger.error(f'Playback error: {error}')
-                else:
-                    logger.info(f'Finished playing {track.title}')
+            logger.info("Started playing '%s' in guild %s", track.title, guild_id,
+                        extra={"guild_id": guild_id, "track_id": track.track_id})
+            return track
 
-                # Update playback state
-                if guild_id in self.playback_states:
-                    self.playback_states[guild_id].status = PlaybackStatus.STOPPED
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error("Playback error: %s", e, extra={"guild_id": guild_id})
+            raise PlaybackError(f"Failed to play music: {str(e)}")
 
-            # Start playing
-            voice_client.play(audio_source, after=after_playing)
+    async def enqueue(self, guild_id: int, url: str, requester_id: Optional[str] = None) -> Track:
+        """Queue music from URL, starting playback if idle"""
+        voice_client = self.voice_manager.get_voice_client(guild_id)
+        if not voice_client or not voice_client.is_connected():
+            raise PlaybackError("Not connected to voice channel")
 
-            # Update playback state
+        if not self._is_active(guild_id, voice_client):
+            return await self.play(guild_id, url, requester_id)
+
+        try:
+            track = await self.youtube_service.extract_track_info(
+                url, requester_id, *self._format_hints(voice_client)
+            )
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            raise PlaybackError(f"Failed to queue music: {str(e)}")
+
+        if self.loudness and not self._passthrough(track):
+            self.loudness.schedule(track)
+
+        self.queues.setdefault(guild_id, deque()).append(track)
+        self.versions.bump(guild_id)
+        logger.info("Queued '%s' in guild %s", track.title, guild_id,
+                    extra={"guild_id": guild_id, "track_id": track.track_id})
+        return track
+
+    def _is_active(self, guild_id: int, voice_client: discord.VoiceClient) -> bool:
+        """Whether the guild has a playing or paused source"""
+        return (self.engine.is_playing(guild_id, voice_client)
+                or self.engine.is_paused(guild_id, voice_client))
+
+    def active_guilds(self) -> List[int]:
+        """Guilds with a playing or paused source"""
+        return [
+            guild_id for guild_id, voice_client in list(self.voice_manager.connections.items())
+            if self._is_active(guild_id, voice_client)
+        ]
+
+    def _format_hints(self, voice_client: discord.VoiceClient) -> Tuple[Optional[int], int]:
+        """Channel bitrate in kbps and live ffmpeg count for format selection"""
+        bitrate = getattr(getattr(voice_client, 'channel', None), 'bitrate', None)
+        live_ffmpeg = sum(len(source.process_ids()) for source in list(self.sources.values()))
+        if self.loudness:
+            live_ffmpeg += len(self.loudness.active_pids)
+        return (bitrate // 1000 if bitrate else None), live_ffmpeg
+
+    def _create_source(self, track: Track, start_at: float = 0) -> discord.AudioSource:
+        """Create an ffmpeg source; PCM when crossfading so frames can be mixed"""
+        volume = self._track_volume(track)
+        ffmpeg_options = self.ffmpeg_config.to_dict(volume)
+        if start_at > 0:
+            ffmpeg_options['before_options'] = f"-ss {start_at:.2f} {ffmpeg_options['before_options']}"
+        if self.playback_config.crossfade_seconds > 0:
+            return discord.FFmpegPCMAudio(track.url, **ffmpeg_options)
+
+        # Opus at unity gain (always, with opus_passthrough) needs no filter,
+        # so ffmpeg only remuxes it
+        if track.codec == 'opus' and abs(volume - 1.0) < 1e-3:
+            ffmpeg_options['options'] = self.ffmpeg_config.options
+            return discord.FFmpegOpusAudio(track.url, codec='opus', **ffmpeg_options)
+
+        # Encoding above the source bitrate only costs CPU
+        bitrate = int(min(128, max(32, track.abr))) if track.abr else 128
+        return discord.FFmpegOpusAudio(track.url, bitrate=bitrate, **ffmpeg_options)
+
+    def _passthrough(self, track: Track) -> bool:
+        """Whether the track is remuxed as-is (never while crossfading, which needs PCM)"""
+        return (self.ffmpeg_config.opus_passthrough and track.codec == 'opus'
+                and self.playback_config.crossfade_seconds <= 0)
+
+    def _track_volume(self, track: Track) -> float:
+        """Normalized static gain, or the default until loudness is measured"""
+        if self._passthrough(track):
+            return 1.0
+        if not self.loudness:
+            return self.ffmpeg_config.volume
+        return self.loudness.get_volume(track.track_id, self.ffmpeg_config.volume)
+
+    def _first_frame_callback(self) -> Optional[Callable[[], None]]:
+        """Finish the current request trace when its first audio frame is read"""
+        trace = current_trace.get()
+        if trace is None:
+            return None
+
+        def on_first_frame():
+            trace.event("first_audio_frame")
+            trace.finish()
+
+        return on_first_frame
+
+    def _next_source(self, guild_id: int) -> Optional[Tuple[discord.AudioSource, Track]]:
+        """Pop the next queued track (called from the preload thread)"""
+        queue = self.queues.get(guild_id)
+        if not queue:
+            return None
+        track = queue.popleft()
+        self.versions.bump(guild_id)
+        return self._create_source(track), track
+
+    def _requeue(self, guild_id: int, track: Track):
+        """Put a preloaded track that was superseded back at the front of the queue"""
+        self.queues.setdefault(guild_id, deque()).appendleft(track)
+        self.versions.bump(guild_id)
+        logger.info("Requeued '%s'", track.title,
+                    extra={"guild_id": guild_id, "track_id": track.track_id})
+
+    def _start(self, guild_id: int, voice_client: discord.VoiceClient, track: Track,
+               start_at: float = 0):
+        """Start a gapless source on the voice client"""
+        def on_track_change(new_track: Track):
             self.playback_states[guild_id] = PlaybackState(
                 status=PlaybackStatus.PLAYING,
-                current_track=track,
-                position=0
+                current_track=new_track,
+                position=0,
+                volume=self._track_volume(new_track)
             )
+            self.versions.bump(guild_id)
 
-            logger.info(f"Started playing '{track.title}' in guild {guild_id}")
-            return track
+        with trace_span("ffmpeg_spawn"):
+            first_source = self._create_source(track, start_at)
 
-        except Exception as e:
-            logger.error(f"Playback error: {e}")
-            raise PlaybackError(f"Failed to play music: {str(e)}")
+        trace = current_trace.get()
+        audio_source = GaplessAudioSource(
+            first_source,
+            track,
+            lambda: self._next_source(guild_id),
+            self.playback_config,
+            on_track_change=on_track_change,
+            on_first_frame=self._first_frame_callback(),
+            start_position=start_at,
+            requeue=lambda queued: self._requeue(guild_id, queued)
+        )
+
+        # Setup playback callback
+        def after_playing(error: Optional[Exception]):
+            log_context = {"guild_id": guild_id, "track_id": audio_source.track.track_id}
+            if trace:
+                trace.finish(error)
+            if error:
+                logger.error('Playback error: %s', error, extra=log_context)
+            else:
+                logger.info('Finished playing %s', audio_source.track.title, extra=log_context)
+
+            # A replaced source finishing late must not touch the new track's state
+            if self.sources.get(guild_id) is not audio_source:
+                return
+            del self.sources[guild_id]
+
+            # Update playback state
+            if guild_id in self.playback_states:
+                self.playback_states[guild_id].status = PlaybackStatus.STOPPED
+                self.versions.bump(guild_id)
+
+        # Start playing
+        self.engine.play(guild_id, voice_client, audio_source, after_playing)
+        self.sources[guild_id] = audio_source
+
+        # Update playback state
+        on_track_change(track)
 
     def stop(self, guild_id: int) -> bool:
         """Stop playback"""
         try:
             voice_client = self.voice_manager.get_voice_client(guild_id)
-            if voice_client and (voice_client.is_playing() or voice_client.is_paused()):
-                voice_client.stop()
+            if voice_client and self._is_active(guild_id, voice_client):
+                self.queues.pop(guild_id, None)
+                self.engine.stop(guild_id, voice_client)
                 self.playback_states[guild_id] = PlaybackState(status=PlaybackStatus.STOPPED)
+                self.versions.bump(guild_id)
                 return True
             return False
         except Exception as e:
-            logger.error(f"Stop error: {e}")
+            logger.error("Stop error: %s", e, extra={"guild_id": guild_id})
             return False
 
+    def release(self, guild_id: int):
+        """Stop playback and drop all per-guild state"""
+        self.stop(guild_id)
+        self.queues.pop(guild_id, None)
+        self.playback_states.pop(guild_id, None)
+        self.versions.bump(guild_id)
+
+    def clear_queue(self, guild_id: int):
+        """Drop queued tracks, letting the current one finish"""
+        if self.queues.pop(guild_id, None):
+            self.versions.bump(guild_id)
+
     def pause(self, guild_id: int) -> bool:
         """Pause playback"""
         try:
             voice_client = self.voice_manager.get_voice_client(guild_id)
-            if voice_client and voice_client.is_playing():
-                voice_client.pause()
+            if voice_client and self.engine.is_playing(guild_id, voice_client):
+                self.engine.pause(guild_id, voice_client)
                 if guild_id in self.playback_states:
                     self.playback_states[guild_id].status = PlaybackStatus.PAUSED
+                    self.versions.bump(guild_id)
                 return True
             return False
         except Exception as e:
-            logger.error(f"Pause error: {e}")
+            logger.error("Pause error: %s", e, extra={"guild_id": guild_id})
             return False
 
     def resume(self, guild_id: int) -> bool:
         """Resume playback"""
         try:
             voice_client = self.voice_manager.get_voice_client(guild_id)
-            if voice_client and voice_client.is_paused():
-                voice_client.resume()
+            if voice_client and self.engine.is_paused(guild_id, voice_client):
+                self.engine.resume(guild_id, voice_client)
                 if guild_id in self.playback_states:
                     self.playback_states[guild_id].status = PlaybackStatus.PLAYING
+                    self.versions.bump(guild_id)
                 return True
             return False
         except Exception as e:
-            logger.error(f"Resume error: {e}")
+            logger.error("Resume error: %s", e, extra={"guild_id": guild_id})
             return False
 
     def get_playback_state(self, guild_id: int) -> PlaybackState:
         """Get current playback state"""
-        return self.playback_states.get(guild_id, PlaybackState())
+        state = self.playback_states.get(guild_id, PlaybackState())
+        source = self.sources.get(guild_id)
+        if source and state.status != PlaybackStatus.STOPPED:
+            state.position = int(source.position)
+        return state
+
+    def next_track(self, guild_id: int) -> Optional[Track]:
+        """Preloaded track that is no longer in the queue"""
+        source = self.sources.get(guild_id)
+        return source.next_track() if source else None
+
+    def get_queue(self, guild_id: int) -> Tuple[Track, ...]:
+        """Get queued tracks for guild"""
+        return tuple(self.queues.get(guild_id, ()))
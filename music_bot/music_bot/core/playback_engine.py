@@ -0,0 +1,299 @@
+import discord
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+AfterCallback = Callable[[Optional[Exception]], None]
+
+FRAME_DELAY = 0.02  # 20ms Opus frames, same pacing as discord.py's AudioPlayer
+OPUS_SILENCE = b'\xf8\xff\xfe'
+SILENCE_FRAMES = 5
+
+class VoiceClientEngine:
+    """Stock playback: one discord.py AudioPlayer thread per guild"""
+
+    name = "voice_client"
+
+    def play(self, guild_id: int, voice_client: discord.VoiceClient,
+             source: discord.AudioSource, after: AfterCallback):
+        voice_client.play(source, after=after)
+
+    def stop(self, guild_id: int, voice_client: discord.VoiceClient):
+        voice_client.stop()
+
+    def pause(self, guild_id: int, voice_client: discord.VoiceClient):
+        voice_client.pause()
+
+    def resume(self, guild_id: int, voice_client: discord.VoiceClient):
+        voice_client.resume()
+
+    def is_playing(self, guild_id: int, voice_client: discord.VoiceClient) -> bool:
+        return voice_client.is_playing()
+
+    def is_paused(self, guild_id: int, voice_client: discord.VoiceClient) -> bool:
+        return voice_client.is_paused()
+
+    def get_source(self, guild_id: int, voice_client: discord.VoiceClient) -> Optional[discord.AudioSource]:
+        return voice_client.source
+
+    def stats(self) -> Dict[str, object]:
+        return {"engine": self.name}
+
+class _Session:
+    """Per-guild playback bookkeeping for the multiplexed sender"""
+
+    def __init__(self, voice_client: discord.VoiceClient,
+                 source: discord.AudioSource, after: AfterCallback):
+        self.voice_client = voice_client
+        self.source = source
+        self.after = after
+        self.paused = False
+        self.stopped = False
+        self.finished = False
+        self.silence_left = 0
+        self.disconnected_since: Optional[float] = None
+        self.frames_sent = 0
+
+class _SenderShard(threading.Thread):
+    """Timer-paced thread sending one frame per tick for each of its guilds"""
+
+    def __init__(self, index: int, reconnect_grace: float, resync_frames: int):
+        super().__init__(daemon=True, name=f"AudioSender-{index}")
+        self.sessions: Dict[int, _Session] = {}
+        self.reconnect_grace = reconnect_grace
+        self.resync_frames = resync_frames
+        self._retired: List[_Session] = []
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+
+        self.ticks = 0
+        self.overruns = 0
+        self.resyncs = 0
+        self.lateness: Deque[float] = deque(maxlen=3000)
+
+    def add(self, guild_id: int, session: _Session):
+        with self._lock:
+            previous = self.sessions.get(guild_id)
+            if previous:
+                # A stopped session not yet reaped; finish it on the sender thread
+                self._retired.append(previous)
+            self.sessions[guild_id] = session
+        self._wakeup.set()
+
+    def run(self):
+        while True:
+            if not self.sessions:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            # Drift-corrected schedule: tick n is due at start + n * FRAME_DELAY
+            start = time.perf_counter()
+            loops = 0
+            while self.sessions:
+                due = start + FRAME_DELAY * loops
+                now = time.perf_counter()
+                self.lateness.append(now - due)
+
+                with self._lock:
+                    sessions = list(self.sessions.items())
+                    retired, self._retired = self._retired, []
+                for session in retired:
+                    self._finish(None, session)
+                for guild_id, session in sessions:
+                    self._service(guild_id, session)
+
+                self.ticks += 1
+                loops += 1
+                finished = time.perf_counter()
+                if finished - now > FRAME_DELAY:
+                    self.overruns += 1
+
+                delay = start + FRAME_DELAY * loops - finished
+                if delay < -FRAME_DELAY * self.resync_frames:
+                    # Too far behind to catch up without bursting; restart the clock
+                    self.resyncs += 1
+                    start = finished
+                    loops = 0
+                elif delay > 0:
+                    time.sleep(delay)
+
+    def _service(self, guild_id: int, session: _Session):
+        """Send the next frame (or silence) for one guild"""
+        if session.stopped:
+            self._finish(guild_id, session)
+            return
+
+        voice_client = session.voice_client
+        if not voice_client.is_connected():
+            if _detached(voice_client):
+                # Disconnected on purpose rather than reconnecting
+                self._finish(guild_id, session)
+                return
+            now = time.monotonic()
+            if session.disconnected_since is None:
+                session.disconnected_since = now
+            elif now - session.disconnected_since > self.reconnect_grace:
+                self._finish(guild_id, session)
+            return
+        session.disconnected_since = None
+
+        try:
+            if session.paused:
+                if session.silence_left:
+                    voice_client.send_audio_packet(OPUS_SILENCE, encode=False)
+                    session.silence_left -= 1
+                return
+
+            data = session.source.read()
+            if not data:
+                self._finish(guild_id, session)
+                return
+
+            voice_client.send_audio_packet(data, encode=not session.source.is_opus())
+            session.frames_sent += 1
+        except Exception as e:
+            logger.error("Audio sender error: %s", e, extra={"guild_id": guild_id})
+            self._finish(guild_id, session, e)
+
+    def _finish(self, guild_id: Optional[int], session: _Session,
+                error: Optional[Exception] = None):
+        with self._lock:
+            if self.sessions.get(guild_id) is session:
+                del self.sessions[guild_id]
+            # A retired session may also have been serviced in a tick already under way
+            if session.finished:
+                return
+            session.finished = True
+
+        try:
+            session.source.cleanup()
+        except Exception as e:
+            logger.error("Audio source cleanup failed: %s", e, extra={"guild_id": guild_id})
+        _speak(session.voice_client, False)
+
+        try:
+            session.after(error)
+        except Exception as e:
+            logger.error("Playback after callback failed: %s", e, extra={"guild_id": guild_id})
+
+class MultiplexedEngine:
+    """Drives every guild's audio source from a small fixed pool of sender threads
+
+    Guilds are sharded across `workers` threads, so a stalled ffmpeg pipe only
+    delays the guilds sharing its shard instead of the whole process. Sources
+    are read on the shard thread and must return silence rather than wait.
+    """
+
+    name = "multiplexed"
+
+    def __init__(self, workers: int = 1, reconnect_grace: float = 30.0,
+                 resync_frames: int = 5):
+        self.shards: List[_SenderShard] = [
+            _SenderShard(index, reconnect_grace, resync_frames)
+            for index in range(max(1, workers))
+        ]
+        for shard in self.shards:
+            shard.start()
+
+    def _shard(self, guild_id: int) -> _SenderShard:
+        return self.shards[guild_id % len(self.shards)]
+
+    def _session(self, guild_id: int, voice_client: discord.VoiceClient) -> Optional[_Session]:
+        """The guild's session on this voice client; one bound to a replaced client is retired"""
+        session = self._shard(guild_id).sessions.get(guild_id)
+        if session is None:
+            return None
+        if session.voice_client is not voice_client:
+            session.stopped = True
+            return None
+        return session
+
+    def play(self, guild_id: int, voice_client: discord.VoiceClient,
+             source: discord.AudioSource, after: AfterCallback):
+        session = self._session(guild_id, voice_client)
+        if session and not session.stopped:
+            raise discord.ClientException("Already playing audio.")
+
+        if not source.is_opus() and not getattr(voice_client, "encoder", None):
+            voice_client.encoder = discord.opus.Encoder()
+
+        _speak(voice_client, True)
+        self._shard(guild_id).add(guild_id, _Session(voice_client, source, after))
+
+    def stop(self, guild_id: int, voice_client: discord.VoiceClient):
+        session = self._session(guild_id, voice_client)
+        if session:
+            session.stopped = True
+
+    def pause(self, guild_id: int, voice_client: discord.VoiceClient):
+        session = self._session(guild_id, voice_client)
+        if session and not session.paused:
+            session.silence_left = SILENCE_FRAMES
+            session.paused = True
+            _speak(voice_client, False)
+
+    def resume(self, guild_id: int, voice_client: discord.VoiceClient):
+        session = self._session(guild_id, voice_client)
+        if session and session.paused:
+            session.paused = False
+            _speak(voice_client, True)
+
+    def is_playing(self, guild_id: int, voice_client: discord.VoiceClient) -> bool:
+        session = self._session(guild_id, voice_client)
+        return session is not None and not session.paused and not session.stopped
+
+    def is_paused(self, guild_id: int, voice_client: discord.VoiceClient) -> bool:
+        session = self._session(guild_id, voice_client)
+        return session is not None and session.paused and not session.stopped
+
+    def get_source(self, guild_id: int, voice_client: discord.VoiceClient) -> Optional[discord.AudioSource]:
+        session = self._session(guild_id, voice_client)
+        return session.source if session else None
+
+    def stats(self) -> Dict[str, object]:
+        """Per-shard tick jitter statistics in milliseconds"""
+        shards = []
+        for shard in self.shards:
+            lateness = sorted(shard.lateness)
+            count = len(lateness)
+            shards.append({
+                "thread": shard.name,
+                "sessions": len(shard.sessions),
+                "ticks": shard.ticks,
+                "overruns": shard.overruns,
+                "resyncs": shard.resyncs,
+                "jitter_ms": {
+                    "mean": sum(lateness) / count * 1000 if count else 0.0,
+                    "p50": lateness[count // 2] * 1000 if count else 0.0,
+                    "p99": lateness[min(count - 1, int(count * 0.99))] * 1000 if count else 0.0,
+                    "max": lateness[-1] * 1000 if count else 0.0,
+                }
+            })
+        return {"engine": self.name, "shards": shards}
+
+def _detached(voice_client: discord.VoiceClient) -> bool:
+    """Whether discord.py no longer tracks the client for its guild (left, not reconnecting)"""
+    guild = getattr(voice_client, "guild", None)
+    return guild is not None and guild.voice_client is not voice_client
+
+def _speak(voice_client: discord.VoiceClient, speaking: bool):
+    """Update speaking state from a sender thread, as discord.py's AudioPlayer does"""
+    state = discord.SpeakingState.voice if speaking else discord.SpeakingState.none
+    try:
+        asyncio.run_coroutine_threadsafe(voice_client.ws.speak(state), voice_client.loop)
+    except Exception as e:
+        logger.error("Speaking call in sender failed: %s", e)
+
+def create_engine(name: str, workers: int = 1):
+    """Create the configured playback engine"""
+    if name == MultiplexedEngine.name:
+        return MultiplexedEngine(workers)
+    if name == VoiceClientEngine.name:
+        return VoiceClientEngine()
+    raise ValueError(f"Unknown playback engine: {name}")
@@ -11,11 +11,16 @@ class PlaybackStatus(str, Enum):
 class Track(BaseModel):
     """Track information model"""
     title: str = Field(..., description="Track title")
-    url: str = Field(..., description="Original URL")
+    url: str = Field(..., description="Playable stream URL")
+    webpage_url: Optional[str] = Field(None, description="Original URL, stable across restarts")
     duration: int = Field(0, ge=0, description="Duration in seconds")
     uploader: str = Field("Unknown", description="Content uploader")
     track_id: str = Field(..., description="Unique track identifier")
     requester_id: Optional[str] = Field(None, description="User ID who requested")
+    format_id: Optional[str] = Field(None, description="Selected stream format")
+    codec: Optional[str] = Field(None, description="Audio codec of the selected stream")
+    abr: Optional[float] = Field(None, description="Audio bitrate of the selected stream in kbps")
+    format_reason: Optional[str] = Field(None, description="Why the stream format was selected")
 
 class PlaybackState(BaseModel):
     """Current playback state"""
@@ -0,0 +1,146 @@
+import time
+from collections import deque
+from enum import Enum
+from typing import Deque, Dict, List, Optional, Tuple
+from ..config.setting import CircuitBreakerConfig
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class CircuitState(str, Enum):
+    """Circuit breaker state enumeration"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """Failure-rate and latency based circuit breaker with adaptive timeout
+
+    Calls are recorded from the bot event loop only. stats() is also read from
+    the API thread, so readers work from a list() snapshot of the window,
+    which is copied without releasing the GIL, instead of iterating the deque.
+    """
+
+    def __init__(self, config: CircuitBreakerConfig):
+        self.config = config
+        self.state = CircuitState.CLOSED
+        self._calls: Deque[Tuple[bool, float]] = deque(maxlen=config.window_size)
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go upstream, moving OPEN -> HALF_OPEN when due"""
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self._opened_at < self.config.open_seconds:
+                return False
+            self._transition(CircuitState.HALF_OPEN)
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self._probes_in_flight >= self.config.half_open_probes:
+                return False
+            self._probes_in_flight += 1
+
+        return True
+
+    def rejecting(self) -> bool:
+        """Whether allow_request() would refuse now, without taking a probe slot"""
+        if self.state == CircuitState.OPEN:
+            return time.monotonic() - self._opened_at < self.config.open_seconds
+        if self.state == CircuitState.HALF_OPEN:
+            return self._probes_in_flight >= self.config.half_open_probes
+        return False
+
+    def retry_after(self) -> float:
+        """Seconds until the next half-open probe is allowed"""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        remaining = self.config.open_seconds - (time.monotonic() - self._opened_at)
+        return max(0.0, remaining)
+
+    def record_success(self, latency: float):
+        """Record a successful upstream call"""
+        if self.state == CircuitState.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            self._calls.clear()
+            self._transition(CircuitState.CLOSED)
+        self._calls.append((True, latency))
+        self._evaluate()
+
+    def release_probe(self):
+        """Hand back a half-open probe slot whose call never completed"""
+        if self.state == CircuitState.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def record_failure(self, latency: float):
+        """Record a failed or timed out upstream call"""
+        if self.state == CircuitState.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            self._trip()
+            return
+        self._calls.append((False, latency))
+        self._evaluate()
+
+    def current_timeout(self) -> float:
+        """Extraction timeout derived from the observed p99 latency"""
+        return self._timeout(list(self._calls))
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Nearest-rank latency percentile of successful calls in the window"""
+        return _percentile(list(self._calls), percentile)
+
+    def stats(self) -> Dict[str, object]:
+        """Snapshot of breaker state for health reporting"""
+        calls = list(self._calls)
+        failures = sum(1 for ok, _ in calls if not ok)
+        return {
+            "state": self.state.value,
+            "calls": len(calls),
+            "failure_rate": failures / len(calls) if calls else 0.0,
+            "p50_latency": _percentile(calls, 0.50),
+            "p99_latency": _percentile(calls, 0.99),
+            "timeout": self._timeout(calls),
+            "retry_after": self.retry_after()
+        }
+
+    def _timeout(self, calls: List[Tuple[bool, float]]) -> float:
+        p99 = _percentile(calls, 0.99)
+        if p99 is None:
+            return self.config.max_timeout
+        timeout = p99 * self.config.timeout_multiplier
+        return min(self.config.max_timeout, max(self.config.min_timeout, timeout))
+
+    def _evaluate(self):
+        """Open the circuit when failure or slow-call rate exceeds its threshold"""
+        if self.state != CircuitState.CLOSED or len(self._calls) < self.config.min_calls:
+            return
+
+        total = len(self._calls)
+        failures = sum(1 for ok, _ in self._calls if not ok)
+        slow = sum(1 for _, latency in self._calls if latency >= self.config.slow_call_seconds)
+
+        if failures / total >= self.config.failure_rate_threshold:
+            logger.warning("Extraction failure rate %d/%d over threshold", failures, total)
+            self._trip()
+        elif slow / total >= self.config.slow_call_rate_threshold:
+            logger.warning("Extraction slow-call rate %d/%d over threshold", slow, total)
+            self._trip()
+
+    def _trip(self):
+        self._opened_at = time.monotonic()
+        self._transition(CircuitState.OPEN)
+
+    def _transition(self, state: CircuitState):
+        if state == self.state:
+            return
+        logger.info("Extraction circuit %s -> %s", self.state.value, state.value)
+        self.state = state
+        if state != CircuitState.HALF_OPEN:
+            self._probes_in_flight = 0
+
+def _percentile(calls: List[Tuple[bool, float]], percentile: float) -> Optional[float]:
+    """Nearest-rank latency percentile of the successful calls"""
+    latencies = sorted(latency for ok, latency in calls if ok)
+    if not latencies:
+        return None
+    index = min(len(latencies) - 1, int(percentile * len(latencies)))
+    return latencies[index]
@@ -0,0 +1,177 @@
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+from ..config.setting import DrainConfig
+from ..models.music import Track
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class DrainController:
+    """Graceful drain for zero-downtime restarts
+
+    Draining stops new /play and /queue calls, lets current tracks finish up
+    to a deadline, persists what each guild was playing, closes voice clients
+    (and with them ffmpeg) with bounded concurrency, then shuts the bot down.
+    The next process picks the saved state up again after on_ready.
+    """
+
+    def __init__(self, music_bot, config: DrainConfig):
+        self.music_bot = music_bot
+        self.config = config
+        self.draining = False
+        self.drain_started: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether new playback may be routed to this process"""
+        return self.music_bot.is_ready() and not self.draining
+
+    def start_drain(self, reason: str) -> bool:
+        """Begin draining on the bot loop; returns False if already draining"""
+        if self._task is not None:
+            return False
+        self._task = asyncio.ensure_future(self.drain(reason))
+        return True
+
+    async def drain(self, reason: str):
+        """Stop accepting playback, wait for tracks to end, persist and shut down"""
+        self.draining = True
+        self.drain_started = time.monotonic()
+        logger.warning("Draining (%s), deadline %.0fs", reason, self.config.deadline_seconds)
+
+        player = self.music_bot.music_player
+
+        # Capture queues before clearing them so current tracks are the last ones played
+        resume_state = {
+            guild_id: self._guild_state(guild_id)
+            for guild_id in list(self.music_bot.voice_manager.connections)
+        }
+        for guild_id in list(player.queues):
+            player.clear_queue(guild_id)
+
+        deadline = self.drain_started + self.config.deadline_seconds
+        while player.active_guilds() and time.monotonic() < deadline:
+            await asyncio.sleep(1)
+
+        # Tracks still playing at the deadline resume from their current position
+        guilds = []
+        for guild_id, state in resume_state.items():
+            state["current"] = self._current_track_state(guild_id)
+            # Preload already took the next track out of the queue snapshot
+            preloaded = player.next_track(guild_id)
+            if preloaded:
+                state["queue"].insert(0, self._track_state(preloaded))
+            if state["current"] or state["queue"]:
+                guilds.append(state)
+        self._save_state(guilds)
+
+        await self._close_all()
+        if self.music_bot.loudness_service:
+            self.music_bot.loudness_service.shutdown()
+        logger.warning("Drain complete in %.1fs", time.monotonic() - self.drain_started)
+
+        if self.config.exit_after_drain:
+            await self.music_bot.close()
+
+    async def resume(self):
+        """Restore playback saved by the previous process's drain"""
+        try:
+            with open(self.config.state_path) as f:
+                guilds: List[Dict[str, Any]] = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.error("Failed to read resume state: %s", e)
+            return
+        finally:
+            if os.path.exists(self.config.state_path):
+                os.remove(self.config.state_path)
+
+        for state in guilds:
+            guild_id = state["guild_id"]
+            try:
+                current = state.get("current")
+                queue = list(state.get("queue", []))
+                if not current and not queue:
+                    continue
+
+                await self.music_bot.voice_manager.join_channel(state["channel_id"], guild_id)
+                if current:
+                    await self.music_bot.music_player.play(
+                        guild_id, current["url"], current.get("requester_id"),
+                        start_at=current.get("position", 0)
+                    )
+                else:
+                    first = queue.pop(0)
+                    await self.music_bot.music_player.play(
+                        guild_id, first["url"], first.get("requester_id")
+                    )
+                for item in queue:
+                    await self.music_bot.music_player.enqueue(
+                        guild_id, item["url"], item.get("requester_id")
+                    )
+                logger.info("Resumed playback", extra={"guild_id": guild_id})
+            except Exception as e:
+                logger.error("Failed to resume guild: %s", e, extra={"guild_id": guild_id})
+
+    def _guild_state(self, guild_id: int) -> Dict[str, Any]:
+        voice_client = self.music_bot.voice_manager.get_voice_client(guild_id)
+        return {
+            "guild_id": guild_id,
+            "channel_id": voice_client.channel.id if voice_client and voice_client.channel else None,
+            "current": None,
+            "queue": [
+                self._track_state(track)
+                for track in self.music_bot.music_player.get_queue(guild_id)
+            ]
+        }
+
+    @staticmethod
+    def _track_state(track: Track) -> Dict[str, Any]:
+        return {"url": track.webpage_url or track.url, "requester_id": track.requester_id}
+
+    def _current_track_state(self, guild_id: int) -> Optional[Dict[str, Any]]:
+        player = self.music_bot.music_player
+        if guild_id not in player.active_guilds():
+            return None
+        state = player.get_playback_state(guild_id)
+        track = state.current_track
+        if not track:
+            return None
+        return {
+            "url": track.webpage_url or track.url,
+            "requester_id": track.requester_id,
+            "position": state.position
+        }
+
+    def _save_state(self, guilds: List[Dict[str, Any]]):
+        guilds = [state for state in guilds if state["channel_id"] is not None]
+        if not guilds:
+            return
+        tmp_path = f"{self.config.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(guilds, f)
+        os.replace(tmp_path, self.config.state_path)
+        logger.info("Saved resume state for %d guilds", len(guilds))
+
+    async def _close_all(self):
+        """Release players and voice clients with bounded concurrency"""
+        semaphore = asyncio.Semaphore(self.config.close_concurrency)
+
+        async def close(guild_id: int):
+            async with semaphore:
+                try:
+                    await asyncio.wait_for(
+                        self.music_bot.leave_channel(guild_id),
+                        timeout=self.config.close_timeout
+                    )
+                except Exception as e:
+                    logger.error("Failed to close voice client: %s", e,
+                                 extra={"guild_id": guild_id})
+
+        guild_ids = list(self.music_bot.voice_manager.connections)
+        await asyncio.gather(*(close(guild_id) for guild_id in guild_ids))
@@ -0,0 +1,166 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set
+from ..config.setting import LoudnessConfig
+from ..models.music import Track
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_LOUDNORM_JSON = re.compile(r'\{[^{}]*"input_i"[^{}]*\}', re.DOTALL)
+
+class LoudnessService:
+    """Background integrated-loudness analysis with a persistent per-track index
+
+    Each track is measured once with ffmpeg's loudnorm filter in analysis-only
+    mode on a small, niced worker pool. Playback then applies a static gain
+    derived from the stored measurement instead of a live two-pass loudnorm.
+    """
+
+    def __init__(self, config: LoudnessConfig, ffmpeg_before_options: str = ""):
+        self.config = config
+        self.ffmpeg_before_options = ffmpeg_before_options
+        self._index: Dict[str, float] = self._load_index()
+        self._pending: Set[str] = set()
+        self._processes: Dict[int, subprocess.Popen] = {}
+        self._closed = False
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, config.workers),
+            thread_name_prefix="LoudnessAnalysis"
+        )
+
+    @property
+    def active_pids(self) -> Set[int]:
+        """PIDs of running analysis ffmpeg processes"""
+        return set(self._processes)
+
+    def get_volume(self, track_id: str, default: float) -> float:
+        """Static gain for track, or the default until it has been measured"""
+        measured = self._index.get(track_id)
+        if measured is None:
+            return default
+
+        volume = default * 10 ** ((self.config.reference_lufs - measured) / 20)
+        return min(self.config.max_volume, max(self.config.min_volume, volume))
+
+    def schedule(self, track: Track) -> bool:
+        """Queue track for analysis unless measured, pending or the pool is full"""
+        with self._lock:
+            if self._closed:
+                return False
+            if track.track_id in self._index or track.track_id in self._pending:
+                return False
+            if len(self._pending) >= self.config.max_pending:
+                logger.debug("Loudness analysis backlog full, skipping %s", track.title,
+                             extra={"track_id": track.track_id})
+                return False
+            self._pending.add(track.track_id)
+
+        self._executor.submit(self._analyze, track)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        return {"measured": len(self._index), "pending": len(self._pending)}
+
+    def shutdown(self):
+        """Drop queued analyses and kill running ffmpeg so none outlive the process"""
+        with self._lock:
+            self._closed = True
+            processes = list(self._processes.values())
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+        if processes:
+            logger.info("Stopped %d loudness analyses", len(processes))
+
+    def _analyze(self, track: Track):
+        started = time.monotonic()
+        try:
+            measured = self._measure(track.url)
+            if measured is None:
+                return
+
+            with self._lock:
+                self._index[track.track_id] = measured
+            self._save_index()
+
+            logger.info("Measured '%s' at %.1f LUFS in %.1fs", track.title, measured,
+                        time.monotonic() - started, extra={"track_id": track.track_id})
+        except Exception as e:
+            logger.error("Loudness analysis failed for '%s': %s", track.title, e,
+                         extra={"track_id": track.track_id})
+        finally:
+            with self._lock:
+                self._pending.discard(track.track_id)
+
+    def _measure(self, url: str) -> Optional[float]:
+        """Run loudnorm in print-only mode and return integrated loudness (LUFS)"""
+        command: List[str] = []
+        if self.config.niceness and shutil.which("nice"):
+            command += ["nice", "-n", str(self.config.niceness)]
+        command += ["ffmpeg", "-hide_banner", "-nostats"]
+        command += self.ffmpeg_before_options.split()
+        command += ["-i", url, "-vn", "-af", "loudnorm=print_format=json", "-f", "null", "-"]
+
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        with self._lock:
+            self._processes[process.pid] = process
+            closed = self._closed
+        if closed:
+            process.kill()
+        try:
+            _, stderr = process.communicate(timeout=self.config.analysis_timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+        finally:
+            with self._lock:
+                self._processes.pop(process.pid, None)
+
+        if self._closed:
+            return None
+        match = _LOUDNORM_JSON.search(stderr)
+        if process.returncode != 0 or not match:
+            logger.warning("ffmpeg loudness analysis returned %s", process.returncode)
+            return None
+
+        measured = float(json.loads(match.group(0))["input_i"])
+        # Silence reports -inf; keep the default gain for it
+        return measured if measured > -70 else None
+
+    def _load_index(self) -> Dict[str, float]:
+        try:
+            with open(self.config.index_path) as f:
+                return {str(k): float(v) for k, v in json.load(f).items()}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error("Failed to load loudness index: %s", e)
+            return {}
+
+    def _save_index(self):
+        """Write the index atomically so a crash never leaves it truncated"""
+        tmp_path = f"{self.config.index_path}.tmp"
+        with self._save_lock:
+            with self._lock:
+                index = dict(self._index)
+            with open(tmp_path, "w") as f:
+                json.dump(index, f)
+            os.replace(tmp_path, self.config.index_path)
@@ -0,0 +1,219 @@
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set
+from ..config.setting import ResourceMonitorConfig
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+def read_proc_stats(pid: int) -> Optional[Dict[str, Any]]:
+    """CPU seconds, RSS and parent PID of a process from /proc, or None if gone"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            stat = f.read()
+        with open(f"/proc/{pid}/status") as f:
+            status = f.read()
+    except (FileNotFoundError, ProcessLookupError, PermissionError):
+        return None
+
+    # comm may contain spaces; fields after it are fixed
+    comm = stat[stat.index("(") + 1:stat.rindex(")")]
+    fields = stat[stat.rindex(")") + 2:].split()
+    rss_kb = 0
+    for line in status.splitlines():
+        if line.startswith("VmRSS:"):
+            rss_kb = int(line.split()[1])
+            break
+
+    return {
+        "pid": pid,
+        "comm": comm,
+        "ppid": int(fields[1]),
+        "cpu_seconds": (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS,
+        "rss_kb": rss_kb
+    }
+
+def child_processes(parent_pid: int, comm: str) -> List[int]:
+    """PIDs of direct children of parent_pid whose command name matches"""
+    pids = []
+    try:
+        entries = os.listdir("/proc")
+    except FileNotFoundError:
+        return pids
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        stats = read_proc_stats(int(entry))
+        if stats and stats["ppid"] == parent_pid and stats["comm"] == comm:
+            pids.append(stats["pid"])
+    return pids
+
+class ResourceMonitor:
+    """Per-guild resource accounting with periodic leak detection
+
+    Every sample reads ffmpeg CPU/RSS from /proc, records the size of each
+    long-lived state dictionary and flags ffmpeg children that no live source
+    owns, as well as dictionaries that have only grown over the recent window.
+    """
+
+    def __init__(self, music_bot, config: ResourceMonitorConfig):
+        self.music_bot = music_bot
+        self.config = config
+        self.warnings: Deque[Dict[str, Any]] = deque(maxlen=100)
+        self._history: Dict[str, Deque[int]] = {}
+        self._cpu_samples: Dict[int, tuple] = {}
+        self._suspect_orphans: Set[int] = set()
+        self._tracemalloc_baseline: Optional[tracemalloc.Snapshot] = None
+        self._lock = threading.Lock()
+
+        if config.tracemalloc_frames > 0:
+            tracemalloc.start(config.tracemalloc_frames)
+            self._tracemalloc_baseline = tracemalloc.take_snapshot()
+
+    def start(self):
+        """Start the background sampler thread"""
+        if self.config.sample_interval <= 0:
+            return
+        threading.Thread(target=self._run, daemon=True, name="ResourceSampler").start()
+
+    def state_counts(self) -> Dict[str, int]:
+        """Sizes of long-lived per-guild and cache structures"""
+        player = self.music_bot.music_player
+        voice_manager = self.music_bot.voice_manager
+        counts = {
+            "playback_states": len(player.playback_states),
+            "sources": len(player.sources),
+            "queues": len(player.queues),
+            "queued_tracks": sum(len(queue) for queue in list(player.queues.values())),
+            "voice_connections": len(voice_manager.connections),
+            "track_cache": len(self.music_bot.youtube_service._track_cache),
+        }
+        if self.music_bot.loudness_service:
+            counts["loudness_pending"] = self.music_bot.loudness_service.stats()["pending"]
+        return counts
+
+    def snapshot(self, include_tracemalloc: bool = False) -> Dict[str, Any]:
+        """Full per-guild resource report"""
+        player = self.music_bot.music_player
+        voice_manager = self.music_bot.voice_manager
+        now = time.monotonic()
+
+        guild_ids = set(player.playback_states) | set(player.sources) | set(voice_manager.connections)
+        guilds = []
+        for guild_id in sorted(guild_ids):
+            source = player.sources.get(guild_id)
+            connected_at = voice_manager.connected_at.get(guild_id)
+            guilds.append({
+                "guild_id": guild_id,
+                "ffmpeg": [self._process_report(pid) for pid in (source.process_ids() if source else [])],
+                "voice_client_age": now - connected_at if connected_at else None,
+                "buffered_frames": source.buffered_frames() if source else None,
+                "queue_length": len(player.queues.get(guild_id, ())),
+                "status": player.get_playback_state(guild_id).status.value
+            })
+
+        report = {
+            "process": self._process_report(os.getpid()),
+            "guilds": guilds,
+            "state_counts": self.state_counts(),
+            "warnings": list(self.warnings)
+        }
+        if include_tracemalloc:
+            report["tracemalloc"] = self.tracemalloc_diff()
+        return report
+
+    def tracemalloc_diff(self, limit: int = 20) -> Optional[List[Dict[str, Any]]]:
+        """Top allocation growth since the previous diff (None unless enabled)"""
+        if not tracemalloc.is_tracing():
+            return None
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        with self._lock:
+            baseline, self._tracemalloc_baseline = self._tracemalloc_baseline, snapshot
+        if baseline is None:
+            return []
+
+        stats = snapshot.compare_to(baseline, "lineno")[:limit]
+        return [
+            {
+                "location": str(stat.traceback),
+                "size_diff_kb": stat.size_diff / 1024,
+                "size_kb": stat.size / 1024,
+                "count_diff": stat.count_diff
+            }
+            for stat in stats
+        ]
+
+    def sample(self):
+        """Record state sizes and flag leaks"""
+        counts = self.state_counts()
+        for name, count in counts.items():
+            history = self._history.setdefault(name, deque(maxlen=self.config.growth_window))
+            history.append(count)
+            if self._is_growing(history):
+                self._warn("growing_state", name=name, history=list(history))
+
+        owned = {pid for source in list(self.music_bot.music_player.sources.values())
+                 for pid in source.process_ids()}
+        if self.music_bot.loudness_service:
+            owned |= self.music_bot.loudness_service.active_pids
+
+        # Require two consecutive sightings so a source being spawned is not flagged
+        orphans = set(child_processes(os.getpid(), "ffmpeg")) - owned
+        for pid in orphans & self._suspect_orphans:
+            self._warn("orphaned_ffmpeg", pid=pid, process=self._process_report(pid))
+        self._suspect_orphans = orphans
+
+    def _is_growing(self, history: Deque[int]) -> bool:
+        """Window is full, never shrank and grew by at least the threshold"""
+        if len(history) < self.config.growth_window:
+            return False
+        values = list(history)
+        never_shrank = all(b >= a for a, b in zip(values, values[1:]))
+        return never_shrank and values[-1] - values[0] >= self.config.growth_threshold
+
+    def _process_report(self, pid: int) -> Dict[str, Any]:
+        stats = read_proc_stats(pid)
+        if stats is None:
+            return {"pid": pid, "alive": False}
+
+        # CPU percent since this PID was last sampled
+        now = time.monotonic()
+        previous = self._cpu_samples.get(pid)
+        self._cpu_samples[pid] = (now, stats["cpu_seconds"])
+        cpu_percent = None
+        if previous and now > previous[0]:
+            cpu_percent = 100 * (stats["cpu_seconds"] - previous[1]) / (now - previous[0])
+
+        return {
+            "pid": pid,
+            "alive": True,
+            "cpu_seconds": stats["cpu_seconds"],
+            "cpu_percent": cpu_percent,
+            "rss_kb": stats["rss_kb"]
+        }
+
+    def _warn(self, kind: str, **details):
+        entry = {"kind": kind, "at": time.time(), **details}
+        self.warnings.append(entry)
+        logger.warning("Resource warning %s: %s", kind, details)
+
+    def _run(self):
+        while True:
+            time.sleep(self.config.sample_interval)
+            try:
+                self.sample()
+                # Forget CPU baselines of processes that have exited
+                for pid in list(self._cpu_samples):
+                    if not os.path.exists(f"/proc/{pid}"):
+                        self._cpu_samples.pop(pid, None)
+            except Exception as e:
+                logger.error("Resource sampling failed: %s", e)
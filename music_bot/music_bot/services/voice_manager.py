@@ -1,18 +1,23 @@
 import discord
 import asyncio
+import time
 from typing import Dict, Optional
 from ..models.music import VoiceConnection
 from ..utils.exceptions import VoiceConnectionError
 from ..utils.logger import setup_logger
+from ..utils.tracing import trace_span
+from ..utils.versioning import StateVersions
 
 logger = setup_logger(__name__)
 
 class VoiceManager:
     """Voice connection management service"""
 
-    def __init__(self, bot: discord.Client):
+    def __init__(self, bot: discord.Client, versions: Optional[StateVersions] = None):
         self.bot = bot
+        self.versions = versions or StateVersions()
         self.connections: Dict[int, discord.VoiceClient] = {}
+        self.connected_at: Dict[int, float] = {}
 
     async def join_channel(self, channel_id: int, guild_id: int) -> VoiceConnection:
         """Join a voice channel"""
@@ -24,14 +29,28 @@ class VoiceManager:
             if not isinstance(channel, discord.VoiceChannel):
                 raise VoiceConnectionError("Channel is not a voice channel")
 
-            # Disconnect from previous channel if connected
-            await self._disconnect_if_connected(guild_id)
-
-            # Connect to new channel
-            voice_client = await channel.connect()
-            self.connections[guild_id] = voice_client
-
-            logger.info(f"Connected to {channel.name} in guild {guild_id}")
+            # Keep a live connection so current playback survives; move it if needed
+            voice_client = self.connections.get(guild_id)
+            if voice_client and voice_client.is_connected():
+                if voice_client.channel is None or voice_client.channel.id != channel_id:
+                    with trace_span("voice_move"):
+                        await voice_client.move_to(channel)
+                    self.versions.bump(guild_id)
+                    logger.info("Moved to %s in guild %s", channel.name, guild_id,
+                                extra={"guild_id": guild_id})
+            else:
+                # Drop a stale client before connecting again
+                with trace_span("voice_disconnect_previous"):
+                    await self._disconnect_if_connected(guild_id)
+
+                with trace_span("voice_connect"):
+                    voice_client = await channel.connect()
+                self.connections[guild_id] = voice_client
+                self.connected_at[guild_id] = time.monotonic()
+                self.versions.bump(guild_id)
+
+                logger.info("Connected to %s in guild %s", channel.name, guild_id,
+                            extra={"guild_id": guild_id})
 
             return VoiceConnection(
                 guild_id=guild_id,
@@ -53,11 +72,14 @@ class VoiceManager:
                 if voice_client.is_connected():
                     await voice_client.disconnect()
                 del self.connections[guild_id]
-                logger.info(f"Left voice channel in guild {guild_id}")
+                self.connected_at.pop(guild_id, None)
+                self.versions.bump(guild_id)
+                logger.info("Left voice channel in guild %s", guild_id,
+                            extra={"guild_id": guild_id})
                 return True
             return False
         except Exception as e:
-            logger.error(f"Error leaving channel: {e}")
+            logger.error("Error leaving channel: %s", e, extra={"guild_id": guild_id})
             return False
 
     def get_voice_client(self, guild_id: int) -> Optional[discord.VoiceClient]:
@@ -76,6 +98,8 @@ class VoiceManager:
             if voice_client.is_connected():
                 await voice_client.disconnect()
             del self.connections[guild_id]
+            self.connected_at.pop(guild_id, None)
+            self.versions.bump(guild_id)
 
     def cleanup_disconnected(self) -> int:
         """Clean up disconnected voice clients"""
@@ -86,6 +110,9 @@ class VoiceManager:
 
         for guild_id in disconnected:
             del self.connections[guild_id]
-            logger.info(f"Cleaned up disconnected client for guild {guild_id}")
+            self.connected_at.pop(guild_id, None)
+            self.versions.bump(guild_id)
+            logger.info("Cleaned up disconnected client for guild %s", guild_id,
+                        extra={"guild_id": guild_id})
 
         return len(disconnected)
@@ -1,27 +1,193 @@
-import yt_dlp
 import asyncio
-from typing import Optional, Dict, Any
+import contextvars
+import hashlib
+import importlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
+from ..config.setting import AudioFormatConfig, CircuitBreakerConfig
 from ..models.music import Track
-from ..utils.exceptions import YouTubeError
+from ..services.circuit_breaker import CircuitBreaker
+from ..utils.exceptions import YouTubeError, CircuitOpenError
 from ..utils.logger import setup_logger
+from ..utils.tracing import trace_span
 
 logger = setup_logger(__name__)
 
+def host_cpu_percent() -> Optional[float]:
+    """One-minute load average as a percentage of available CPUs"""
+    try:
+        load = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return None
+    return 100 * load / (os.cpu_count() or 1)
+
+def select_audio_format(formats: List[Dict[str, Any]],
+                        target_kbps: int) -> Optional[Tuple[Dict[str, Any], str]]:
+    """Cheapest audio-only format meeting target_kbps, preferring Opus
+
+    Only the extractor's most preferred audio track is considered, so dubbed
+    or descriptive tracks (lower language_preference) and formats it ranks
+    down (lower preference) never win on bitrate. Falls back to the highest
+    bitrate below the target. Returns None when the extractor reported no
+    usable audio-only formats.
+    """
+    candidates = [
+        fmt for fmt in formats
+        if fmt.get('url')
+        and not fmt.get('has_drm')
+        and fmt.get('acodec') not in (None, 'none')
+        and fmt.get('vcodec') in (None, 'none')
+        and fmt.get('protocol', 'https') in ('http', 'https')
+        and (fmt.get('abr') or fmt.get('tbr'))
+    ]
+    if not candidates:
+        return None
+
+    def rank(fmt: Dict[str, Any]) -> Tuple[float, float]:
+        return (fmt.get('language_preference') or 0, fmt.get('preference') or 0)
+
+    best_rank = max(rank(fmt) for fmt in candidates)
+    candidates = [fmt for fmt in candidates if rank(fmt) == best_rank]
+
+    def bitrate(fmt: Dict[str, Any]) -> float:
+        return float(fmt.get('abr') or fmt.get('tbr'))
+
+    meeting = [fmt for fmt in candidates if bitrate(fmt) >= target_kbps]
+    opus = [fmt for fmt in meeting if fmt.get('acodec') == 'opus']
+    if opus:
+        return min(opus, key=bitrate), f"cheapest opus >= {target_kbps}kbps"
+    if meeting:
+        return min(meeting, key=bitrate), f"cheapest >= {target_kbps}kbps"
+    return max(candidates, key=bitrate), f"best below {target_kbps}kbps"
+
+def _is_expected_error(error: BaseException) -> bool:
+    """Whether yt-dlp flagged the error as expected (bad link, not an outage)
+
+    DownloadError wraps the ExtractorError that carries the flag in exc_info.
+    """
+    for _ in range(3):
+        if error is None:
+            break
+        if getattr(error, 'expected', False):
+            return True
+        exc_info = getattr(error, 'exc_info', None)
+        error = exc_info[1] if exc_info else None
+    return False
+
 class YouTubeService:
     """YouTube-DL service wrapper"""
 
-    def __init__(self, ytdl_options: Dict[str, Any]):
+    def __init__(self, ytdl_options: Dict[str, Any],
+                 breaker_config: Optional[CircuitBreakerConfig] = None,
+                 format_config: Optional[AudioFormatConfig] = None,
+                 extractor_modules: Optional[List[str]] = None,
+                 extract_workers: int = 4):
         self.ytdl_options = ytdl_options
-        self.ytdl = yt_dlp.YoutubeDL(ytdl_options)
+        self.extractor_modules = extractor_modules or ["youtube"]
+        self.format_config = format_config or AudioFormatConfig()
+        self._ytdl = None
+        self._ytdl_lock = threading.Lock()
+        self.breaker_config = breaker_config or CircuitBreakerConfig()
+        self.circuit_breaker = CircuitBreaker(self.breaker_config)
+        self._track_cache: "OrderedDict[str, Tuple[float, Track]]" = OrderedDict()
+        # Own pool so hung extractions cannot starve the loop's default executor
+        self._executor = ThreadPoolExecutor(max_workers=extract_workers,
+                                            thread_name_prefix="ytdl")
+
+    @property
+    def ytdl(self):
+        """YoutubeDL instance, built on first use
+
+        Importing yt_dlp and registering its extractors dominates startup, so it
+        is deferred until warm_up() or the first extraction, and only the
+        configured extractor modules are imported.
+        """
+        if self._ytdl is None:
+            with self._ytdl_lock:
+                if self._ytdl is None:
+                    started = time.monotonic()
+                    import yt_dlp
+                    if self.extractor_modules == ["default"]:
+                        ytdl = yt_dlp.YoutubeDL(self.ytdl_options)
+                    else:
+                        # auto_init would import every extractor before filtering
+                        ytdl = yt_dlp.YoutubeDL(self.ytdl_options, auto_init=False)
+                        for extractor in self._extractor_classes():
+                            ytdl.add_info_extractor(extractor)
+                    self._ytdl = ytdl
+                    logger.info("YoutubeDL ready in %.2fs with %d extractors",
+                                time.monotonic() - started, len(ytdl._ies))
+        return self._ytdl
+
+    def _extractor_classes(self) -> List[type]:
+        """Enabled extractor classes from the configured yt_dlp.extractor modules"""
+        from yt_dlp.extractor.common import InfoExtractor
+
+        classes = []
+        for name in self.extractor_modules:
+            module = importlib.import_module(f"yt_dlp.extractor.{name.strip()}")
+            # Sorted by name, the order yt-dlp itself registers them in
+            for attr in sorted(vars(module)):
+                value = getattr(module, attr)
+                if (attr.endswith("IE") and isinstance(value, type)
+                        and issubclass(value, InfoExtractor) and value._ENABLED):
+                    classes.append(value)
+        return classes
+
+    async def warm_up(self):
+        """Build the extraction engine on an executor thread"""
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, lambda: self.ytdl)
+
+    def check_available(self, url: str):
+        """Raise CircuitOpenError if extracting url would be refused right now
+
+        Lets callers fail before side effects such as joining voice.
+        """
+        if self.circuit_breaker.rejecting() and url not in self._track_cache:
+            raise CircuitOpenError(
+                "YouTube extraction temporarily unavailable",
+                retry_after=self.circuit_breaker.retry_after()
+            )
 
-    async def extract_track_info(self, url: str, requester_id: Optional[str] = None) -> Track:
-        """Extract track information from URL"""
+    async def extract_track_info(self, url: str, requester_id: Optional[str] = None,
+                                 channel_kbps: Optional[int] = None,
+                                 live_ffmpeg: int = 0) -> Track:
+        """Extract track information from URL
+
+        channel_kbps and live_ffmpeg steer which stream format is picked.
+        """
+        if not self.circuit_breaker.allow_request():
+            cached = self._get_cached(url, requester_id)
+            if cached:
+                logger.info("Extraction circuit open, serving cached metadata for %s", url,
+                            extra={"track_id": cached.track_id})
+                return cached
+            retry_after = self.circuit_breaker.retry_after()
+            raise CircuitOpenError(
+                "YouTube extraction temporarily unavailable",
+                retry_after=retry_after
+            )
+
+        timeout = self.circuit_breaker.current_timeout()
+        started = time.monotonic()
         try:
             loop = asyncio.get_event_loop()
-            data = await loop.run_in_executor(
-                None,
-                lambda: self.ytdl.extract_info(url, download=False)
-            )
+            context = contextvars.copy_context()
+            with trace_span("extract"):
+                data = await asyncio.wait_for(
+                    loop.run_in_executor(
+                        self._executor,
+                        context.run,
+                        self._extract_info,
+                        url
+                    ),
+                    timeout=timeout
+                )
 
             if not data:
                 raise YouTubeError("No data found for URL")
@@ -30,22 +196,116 @@ class YouTubeService:
             title = str(data.get('title', 'Unknown'))
             duration = int(data.get('duration', 0))
             uploader = str(data.get('uploader', 'Unknown'))
-            playable_url = data.get('url')
+            stream, reason = self._select_stream(data, channel_kbps, live_ffmpeg)
+            playable_url = stream.get('url')
 
             if not playable_url:
                 raise YouTubeError("No playable URL found")
 
-            track_id = str(hash(url + str(requester_id or '')))
+            track_id = self._stable_track_id(url, data)
 
-            return Track(
+            abr = stream.get('abr') or stream.get('tbr')
+            track = Track(
                 title=title,
                 url=playable_url,
+                webpage_url=str(data.get('webpage_url') or url),
                 duration=duration,
                 uploader=uploader,
                 track_id=track_id,
-                requester_id=requester_id
+                requester_id=requester_id,
+                format_id=stream.get('format_id'),
+                codec=stream.get('acodec'),
+                abr=float(abr) if abr else None,
+                format_reason=reason
             )
+            logger.debug("Selected format %s (%s, %skbps): %s", track.format_id, track.codec,
+                         track.abr, reason, extra={"track_id": track_id})
 
+        except asyncio.TimeoutError:
+            self.circuit_breaker.record_failure(time.monotonic() - started)
+            logger.error("Extraction timed out after %.1fs", timeout)
+            raise YouTubeError(f"Timed out processing URL after {timeout:.1f}s")
         except Exception as e:
-            logger.error(f"Failed to extract track info: {e}")
+            # Unavailable or private videos are answers, not upstream failures
+            if _is_expected_error(e):
+                self.circuit_breaker.record_success(time.monotonic() - started)
+            else:
+                self.circuit_breaker.record_failure(time.monotonic() - started)
+            logger.error("Failed to extract track info: %s", e)
             raise YouTubeError(f"Failed to process URL: {str(e)}")
+        except BaseException:
+            # Cancelled (API timeout, shutdown): free a half-open probe slot
+            self.circuit_breaker.release_probe()
+            raise
+
+        self.circuit_breaker.record_success(time.monotonic() - started)
+        self._put_cached(url, track)
+        return track
+
+    def _select_stream(self, data: Dict[str, Any], channel_kbps: Optional[int],
+                       live_ffmpeg: int) -> Tuple[Dict[str, Any], str]:
+        """Pick the stream to play and say why"""
+        if not self.format_config.adaptive:
+            return data, "ytdl format"
+
+        target, reason = self.target_bitrate(channel_kbps, live_ffmpeg)
+        selected = select_audio_format(data.get('formats') or [], target)
+        if selected is None:
+            return data, "ytdl format, no audio-only formats"
+        stream, choice = selected
+        return stream, f"{choice} ({reason})"
+
+    def target_bitrate(self, channel_kbps: Optional[int], live_ffmpeg: int) -> Tuple[int, str]:
+        """Bitrate to aim for, stepped down while the host is overloaded"""
+        config = self.format_config
+        if channel_kbps:
+            target, reason = channel_kbps, "channel bitrate"
+        else:
+            target, reason = config.default_bitrate_kbps, "default bitrate"
+
+        overload = None
+        if live_ffmpeg >= config.max_live_ffmpeg:
+            overload = f"{live_ffmpeg} live ffmpeg"
+        else:
+            cpu = host_cpu_percent()
+            if cpu is not None and cpu >= config.cpu_threshold_percent:
+                overload = f"host cpu {cpu:.0f}%"
+
+        if overload and target > config.overload_bitrate_kbps:
+            return config.overload_bitrate_kbps, f"{reason}, stepped down for {overload}"
+        return target, reason
+
+    def _extract_info(self, url: str) -> Optional[Dict[str, Any]]:
+        """Blocking yt-dlp extraction, run on an executor thread"""
+        with trace_span("ytdl_extract_info"):
+            return self.ytdl.extract_info(url, download=False)
+
+    @staticmethod
+    def _stable_track_id(url: str, data: Dict[str, Any]) -> str:
+        """Track ID that is stable across requests and restarts"""
+        video_id = data.get('id')
+        if video_id:
+            extractor = str(data.get('extractor_key') or 'generic').lower()
+            return f"{extractor}:{video_id}"
+        return "url:" + hashlib.sha1(url.encode()).hexdigest()
+
+    def _get_cached(self, url: str, requester_id: Optional[str]) -> Optional[Track]:
+        """Get unexpired cached track metadata for URL"""
+        entry = self._track_cache.get(url)
+        if not entry:
+            return None
+
+        cached_at, track = entry
+        if time.monotonic() - cached_at > self.breaker_config.cache_ttl:
+            del self._track_cache[url]
+            return None
+
+        self._track_cache.move_to_end(url)
+        return track.copy(update={"requester_id": requester_id})
+
+    def _put_cached(self, url: str, track: Track):
+        """Cache track metadata, evicting the least recently used entry"""
+        self._track_cache[url] = (time.monotonic(), track)
+        self._track_cache.move_to_end(url)
+        while len(self._track_cache) > self.breaker_config.cache_size:
+            self._track_cache.popitem(last=False)
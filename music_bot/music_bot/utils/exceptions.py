@@ -13,3 +13,10 @@ class PlaybackError(MusicBotException):
 class YouTubeError(MusicBotException):
     """YouTube-DL related errors"""
     pass
+
+class CircuitOpenError(YouTubeError):
+    """Raised when extraction is short-circuited during an upstream incident"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
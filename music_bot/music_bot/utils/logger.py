@@ -1,20 +1,153 @@
+import atexit
+import itertools
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import threading
+from typing import Dict, Optional, Set
 
-def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
-    """Setup logger with consistent formatting"""
+# Extra record attributes promoted to top-level JSON fields
+CONTEXT_FIELDS = ("guild_id", "track_id", "request_id")
+
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(
+    maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+)
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+_configured: Set[str] = set()
+_setup_lock = threading.Lock()
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line with guild/track context fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """Keep 1 in N records tagged with extra={"sample": key}
+
+    Untagged records always pass. Sampling is counter based so it is cheap and
+    deterministic; warnings and above are never sampled out.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.rates: Dict[str, int] = {}
+        self._counters: Dict[str, "itertools.count[int]"] = {}
+
+    def set_rate(self, key: str, every: int):
+        self.rates[key] = max(1, every)
+        self._counters[key] = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "sample", None)
+        if key is None or record.levelno >= logging.WARNING:
+            return True
+        every = self.rates.get(key, 1)
+        if every == 1:
+            return True
+        counter = self._counters.setdefault(key, itertools.count())
+        return next(counter) % every == 0
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never formats or blocks in the calling thread"""
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same-process queue: defer msg % args to the listener thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _NonBlockingQueueHandler.dropped += 1
+
+sampling_filter = SamplingFilter()
+
+def _start_listener() -> logging.Handler:
+    """Start the background writer thread once per process"""
+    global _listener, _queue_handler
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if os.getenv("LOG_FORMAT", "json").lower() == "text":
+        stream_handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        ))
+    else:
+        stream_handler.setFormatter(JSONFormatter())
+
+    _listener = logging.handlers.QueueListener(
+        _log_queue, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    _queue_handler = _NonBlockingQueueHandler(_log_queue)
+    _queue_handler.addFilter(sampling_filter)
+    return _queue_handler
+
+def setup_logger(name: str, level: Optional[str] = None) -> logging.Logger:
+    """Setup logger writing through the shared background queue"""
     logger = logging.getLogger(name)
 
     if logger.handlers:
         return logger
 
-    logger.setLevel(getattr(logging, level.upper()))
+    with _setup_lock:
+        handler = _queue_handler or _start_listener()
 
-    handler = logging.StreamHandler(sys.stdout)
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    handler.setFormatter(formatter)
+    level = level or os.getenv("LOG_LEVEL", "INFO")
+    logger.setLevel(getattr(logging, level.upper()))
     logger.addHandler(handler)
+    _configured.add(name)
 
     return logger
+
+def route_library_logger(name: str, level: Optional[str] = None) -> logging.Logger:
+    """Send a third-party logger (uvicorn, discord) through the background queue
+
+    Propagation is cut so records are not also written by root handlers.
+    """
+    logger = setup_logger(name, level)
+    logger.propagate = False
+    return logger
+
+def set_log_level(level: str, name: Optional[str] = None) -> Dict[str, str]:
+    """Change the level of one or all configured loggers at runtime"""
+    numeric = logging.getLevelName(level.upper())
+    if not isinstance(numeric, int):
+        raise ValueError(f"Unknown log level: {level}")
+
+    names = [name] if name else sorted(_configured)
+    for logger_name in names:
+        logging.getLogger(logger_name).setLevel(numeric)
+    return {logger_name: level.upper() for logger_name in names}
+
+def set_sample_rate(key: str, every: int):
+    """Keep one in `every` records tagged with extra={"sample": key}"""
+    sampling_filter.set_rate(key, every)
+
+def get_logging_stats() -> Dict[str, int]:
+    """Queue depth and drop counter for the async logging pipeline"""
+    return {
+        "queued": _log_queue.qsize(),
+        "dropped": _NonBlockingQueueHandler.dropped,
+    }
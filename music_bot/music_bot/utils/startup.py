@@ -0,0 +1,22 @@
+import time
+from typing import Dict
+
+class StartupTimer:
+    """Milestones since process start, for startup benchmarking"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+
+    def mark(self, name: str):
+        """Record a milestone once; later marks with the same name are ignored"""
+        self.marks.setdefault(name, time.perf_counter())
+
+    def report(self) -> Dict[str, float]:
+        """Milliseconds from process start to each milestone, in order"""
+        return {
+            name: round((at - self.started) * 1000, 1)
+            for name, at in sorted(self.marks.items(), key=lambda item: item[1])
+        }
+
+startup_timer = StartupTimer()
@@ -0,0 +1,241 @@
+import contextvars
+import heapq
+import itertools
+import json
+import os
+import queue
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+current_trace: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar(
+    "current_trace", default=None
+)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+class Span:
+    """Timed stage of a trace"""
+
+    def __init__(self, name: str, start: float, parent: Optional["Span"] = None):
+        self.span_id = os.urandom(8).hex()
+        self.name = name
+        self.start = start
+        self.end: Optional[float] = None
+        self.parent = parent
+        self.thread = threading.current_thread().name
+        self.error: Optional[str] = None
+
+class Trace:
+    """Spans and events for one request, shared across loops and threads"""
+
+    def __init__(self, tracer: "Tracer", name: str, request_id: Optional[str] = None):
+        self.tracer = tracer
+        self.trace_id = os.urandom(16).hex()
+        self.request_id = request_id or self.trace_id
+        self.name = name
+        self.started_ns = time.time_ns()
+        self.started = time.monotonic()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+        self.attributes: Dict[str, Any] = {}
+        self.spans: List[Span] = []
+        self.events: List[Tuple[str, float, str]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[Span]:
+        """Time a stage; nests under the enclosing span in the same context"""
+        parent = _current_span.get()
+        span = Span(name, time.monotonic(), parent)
+        with self._lock:
+            self.spans.append(span)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = str(e)
+            raise
+        finally:
+            span.end = time.monotonic()
+            _current_span.reset(token)
+
+    def add_span(self, name: str, start: float, end: float):
+        """Record a stage whose start and end were measured elsewhere"""
+        span = Span(name, start, _current_span.get())
+        span.end = end
+        with self._lock:
+            self.spans.append(span)
+
+    def event(self, name: str):
+        """Record a point-in-time marker"""
+        with self._lock:
+            self.events.append((name, time.monotonic(), threading.current_thread().name))
+
+    def finish(self, error: Optional[BaseException] = None):
+        """Close the trace once; later calls are ignored"""
+        with self._lock:
+            if self.duration is not None:
+                return
+            self.duration = time.monotonic() - self.started
+            if error is not None:
+                self.error = str(error)
+        self.tracer.record(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        def offset_ms(timestamp: Optional[float]) -> Optional[float]:
+            return _ms(timestamp - self.started) if timestamp is not None else None
+
+        with self._lock:
+            spans = list(self.spans)
+            events = list(self.events)
+
+        return {
+            "request_id": self.request_id,
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_ns / 1e9,
+            "duration_ms": _ms(self.duration) if self.duration is not None else None,
+            "error": self.error,
+            "attributes": self.attributes,
+            "spans": [
+                {
+                    "name": span.name,
+                    "parent": span.parent.name if span.parent else None,
+                    "start_ms": offset_ms(span.start),
+                    "end_ms": offset_ms(span.end),
+                    "duration_ms": _ms(span.end - span.start) if span.end else None,
+                    "thread": span.thread,
+                    "error": span.error
+                }
+                for span in spans
+            ],
+            "events": [
+                {"name": name, "at_ms": offset_ms(at), "thread": thread}
+                for name, at, thread in events
+            ]
+        }
+
+class Tracer:
+    """Keeps the slowest N finished traces and optionally exports them over OTLP/HTTP"""
+
+    def __init__(self, keep_slowest: int = 50, otlp_endpoint: Optional[str] = None,
+                 service_name: str = "music-bot"):
+        self.keep_slowest = keep_slowest
+        self.otlp_endpoint = otlp_endpoint
+        self.service_name = service_name
+        self._slowest: List[Tuple[float, int, Trace]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._export_queue: Optional[queue.Queue] = None
+
+        if otlp_endpoint:
+            self._export_queue = queue.Queue(maxsize=1000)
+            threading.Thread(target=self._export_loop, daemon=True, name="TraceExporter").start()
+
+    def start(self, name: str, request_id: Optional[str] = None) -> Trace:
+        """Start a trace and make it current for this context"""
+        trace = Trace(self, name, request_id)
+        current_trace.set(trace)
+        return trace
+
+    def record(self, trace: Trace):
+        """Keep trace if it is among the slowest seen"""
+        entry = (trace.duration, next(self._counter), trace)
+        with self._lock:
+            if len(self._slowest) < self.keep_slowest:
+                heapq.heappush(self._slowest, entry)
+            elif trace.duration > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+        if self._export_queue is not None:
+            try:
+                self._export_queue.put_nowait(trace)
+            except queue.Full:
+                pass
+
+    def slowest(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            traces = sorted(self._slowest, reverse=True)
+        return [trace.to_dict() for _, _, trace in traces]
+
+    def _export_loop(self):
+        while True:
+            trace = self._export_queue.get()
+            try:
+                body = json.dumps(self._to_otlp(trace)).encode()
+                request = urllib.request.Request(
+                    self.otlp_endpoint,
+                    data=body,
+                    headers={"Content-Type": "application/json"},
+                    method="POST"
+                )
+                urllib.request.urlopen(request, timeout=5).close()
+            except Exception as e:
+                logger.debug("Trace export failed: %s", e)
+
+    def _to_otlp(self, trace: Trace) -> Dict[str, Any]:
+        """Encode a trace as an OTLP/HTTP JSON ExportTraceServiceRequest"""
+        def unix_ns(timestamp: float) -> str:
+            return str(trace.started_ns + int((timestamp - trace.started) * 1e9))
+
+        root_id = os.urandom(8).hex()
+        spans = [{
+            "traceId": trace.trace_id,
+            "spanId": root_id,
+            "name": trace.name,
+            "kind": 2,
+            "startTimeUnixNano": str(trace.started_ns),
+            "endTimeUnixNano": unix_ns(trace.started + trace.duration),
+            "attributes": [
+                {"key": "request_id", "value": {"stringValue": trace.request_id}}
+            ] + [
+                {"key": key, "value": {"stringValue": str(value)}}
+                for key, value in trace.attributes.items()
+            ],
+            "events": [
+                {"name": name, "timeUnixNano": unix_ns(at)}
+                for name, at, _ in trace.events
+            ],
+            "status": {"code": 2, "message": trace.error} if trace.error else {}
+        }]
+        for span in trace.spans:
+            spans.append({
+                "traceId": trace.trace_id,
+                "spanId": span.span_id,
+                "parentSpanId": span.parent.span_id if span.parent else root_id,
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": unix_ns(span.start),
+                "endTimeUnixNano": unix_ns(span.end if span.end else span.start),
+                "attributes": [{"key": "thread", "value": {"stringValue": span.thread}}],
+                "status": {"code": 2, "message": span.error} if span.error else {}
+            })
+
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    {"key": "service.name", "value": {"stringValue": self.service_name}}
+                ]},
+                "scopeSpans": [{"scope": {"name": "music_bot"}, "spans": spans}]
+            }]
+        }
+
+@contextmanager
+def trace_span(name: str) -> Iterator[Optional[Span]]:
+    """Span on the current trace, or a no-op outside a traced request"""
+    trace = current_trace.get()
+    if trace is None:
+        yield None
+        return
+    with trace.span(name) as span:
+        yield span
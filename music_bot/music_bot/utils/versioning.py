@@ -0,0 +1,64 @@
+import asyncio
+import os
+import threading
+from typing import Dict, List, Tuple
+
+class StateVersions:
+    """Monotonic per-guild state version counters with long-poll waiters
+
+    Bumped by MusicPlayer and VoiceManager whenever they mutate guild state,
+    from the bot loop or from audio threads. Waiters live on the API loop.
+    """
+
+    def __init__(self):
+        # Distinguishes counters across restarts so stale ETags never match
+        self.epoch = os.urandom(4).hex()
+        self._versions: Dict[int, int] = {}
+        self._waiters: Dict[int, List[Tuple[int, asyncio.AbstractEventLoop, asyncio.Future]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, guild_id: int) -> int:
+        return self._versions.get(guild_id, 0)
+
+    def bump(self, guild_id: int) -> int:
+        """Advance the guild's version and wake satisfied waiters"""
+        with self._lock:
+            version = self._versions.get(guild_id, 0) + 1
+            self._versions[guild_id] = version
+            waiters = self._waiters.get(guild_id, [])
+            ready = [waiter for waiter in waiters if waiter[0] <= version]
+            if ready:
+                self._waiters[guild_id] = [waiter for waiter in waiters if waiter[0] > version]
+
+        for _, loop, future in ready:
+            loop.call_soon_threadsafe(_resolve, future, version)
+        return version
+
+    def etag(self, guild_id: int, version: int) -> str:
+        return f'"{self.epoch}-{guild_id}-{version}"'
+
+    async def wait_for(self, guild_id: int, version: int, timeout: float) -> int:
+        """Wait until the guild reaches `version` or timeout; returns the current version"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            current = self._versions.get(guild_id, 0)
+            if current >= version:
+                return current
+            waiter = (version, loop, loop.create_future())
+            self._waiters.setdefault(guild_id, []).append(waiter)
+
+        try:
+            return await asyncio.wait_for(waiter[2], timeout)
+        except asyncio.TimeoutError:
+            return self.get(guild_id)
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(guild_id)
+                if waiters and waiter in waiters:
+                    waiters.remove(waiter)
+                if not waiters:
+                    self._waiters.pop(guild_id, None)
+
+def _resolve(future: asyncio.Future, version: int):
+    if not future.done():
+        future.set_result(version)
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from music_bot.api.server import BotHandle, create_app
+from music_bot.config.setting import APIConfig, DrainConfig
+from music_bot.utils.exceptions import CircuitOpenError
+from music_bot.utils.tracing import Tracer
+
+PLAY = {"guild_id": 1, "channel_id": 2, "url": "https://youtu.be/x", "user_id": "3"}
+
+class FakeBot:
+    def __init__(self):
+        self.settings = SimpleNamespace(api=APIConfig())
+        self.drain_controller = SimpleNamespace(draining=False, config=DrainConfig(retry_after=7))
+        self.tracer = Tracer()
+        self._bot_loop = asyncio.new_event_loop()
+        threading.Thread(target=self._bot_loop.run_forever, daemon=True).start()
+
+    async def play_music(self, *args):
+        raise CircuitOpenError("YouTube extraction temporarily unavailable", retry_after=4.6)
+
+    queue_music = play_music
+
+@pytest.fixture
+def bot():
+    bot = FakeBot()
+    yield bot
+    bot._bot_loop.call_soon_threadsafe(bot._bot_loop.stop)
+
+@pytest.fixture
+def client(bot):
+    handle = BotHandle()
+    handle.attach(bot)
+    return TestClient(create_app(handle))
+
+@pytest.mark.parametrize("route", ["/play", "/queue"])
+def test_open_circuit_returns_error_body(client, route):
+    response = client.post(route, json=PLAY)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+    assert response.json() == {
+        "success": False, "title": "", "error": "YouTube extraction temporarily unavailable"
+    }
+
+def test_draining_returns_error_body(client, bot):
+    bot.drain_controller.draining = True
+    response = client.post("/play", json=PLAY)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
+    assert response.json()["error"] == "Server is draining"
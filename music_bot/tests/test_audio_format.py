@@ -0,0 +1,68 @@
+import pytest
+
+from music_bot.config.setting import AudioFormatConfig
+from music_bot.services import youtube
+from music_bot.services.youtube import YouTubeService, select_audio_format
+
+def audio(format_id: str, abr: float, acodec: str = "opus", **extra) -> dict:
+    fmt = {"format_id": format_id, "url": f"https://media/{format_id}", "abr": abr,
+           "acodec": acodec, "vcodec": "none", "protocol": "https"}
+    fmt.update(extra)
+    return fmt
+
+def test_prefers_cheapest_opus_meeting_target():
+    formats = [audio("249", 50), audio("251", 130), audio("140", 129, "mp4a.40.2"),
+               audio("250", 70)]
+    fmt, reason = select_audio_format(formats, 64)
+    assert fmt["format_id"] == "250"
+    assert reason == "cheapest opus >= 64kbps"
+
+def test_falls_back_to_best_below_target():
+    formats = [audio("249", 50), audio("140", 40, "mp4a.40.2")]
+    fmt, reason = select_audio_format(formats, 96)
+    assert fmt["format_id"] == "249"
+    assert reason == "best below 96kbps"
+
+def test_ignores_video_drm_and_unusable_formats():
+    formats = [
+        audio("18", 96, vcodec="avc1"),
+        audio("251", 130, has_drm=True),
+        audio("hls", 96, protocol="m3u8_native"),
+        audio("nourl", 96, url=None),
+        audio("140", 129, "mp4a.40.2"),
+    ]
+    fmt, _ = select_audio_format(formats, 64)
+    assert fmt["format_id"] == "140"
+    assert select_audio_format([audio("251", 130, has_drm=True)], 64) is None
+
+def test_keeps_to_the_original_audio_track():
+    formats = [
+        audio("251-dubbed", 70, language_preference=-1),
+        audio("251-desc", 70, language_preference=-10),
+        audio("251", 130, language_preference=10),
+    ]
+    fmt, _ = select_audio_format(formats, 64)
+    assert fmt["format_id"] == "251"
+
+def test_skips_formats_the_extractor_ranks_down():
+    formats = [audio("251-drc", 70, preference=-10), audio("251", 130)]
+    fmt, _ = select_audio_format(formats, 64)
+    assert fmt["format_id"] == "251"
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(youtube, "host_cpu_percent", lambda: 10.0)
+    config = AudioFormatConfig(default_bitrate_kbps=64, overload_bitrate_kbps=48,
+                               cpu_threshold_percent=80.0, max_live_ffmpeg=4)
+    return YouTubeService({}, format_config=config)
+
+def test_target_bitrate_follows_channel(service):
+    assert service.target_bitrate(96, 0) == (96, "channel bitrate")
+    assert service.target_bitrate(None, 0) == (64, "default bitrate")
+
+def test_target_bitrate_steps_down_under_load(service, monkeypatch):
+    assert service.target_bitrate(96, 4) == (48, "channel bitrate, stepped down for 4 live ffmpeg")
+    monkeypatch.setattr(youtube, "host_cpu_percent", lambda: 95.0)
+    assert service.target_bitrate(None, 0) == (48, "default bitrate, stepped down for host cpu 95%")
+    # Already at or below the overload bitrate
+    assert service.target_bitrate(32, 4) == (32, "channel bitrate")
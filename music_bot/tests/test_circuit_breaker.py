@@ -0,0 +1,213 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from music_bot.config.setting import CircuitBreakerConfig
+from music_bot.services.circuit_breaker import CircuitBreaker, CircuitState
+from music_bot.services.youtube import YouTubeService
+from music_bot.utils.exceptions import CircuitOpenError, YouTubeError
+
+def make_breaker(**overrides) -> CircuitBreaker:
+    options = {"min_calls": 2, "open_seconds": 0.01}
+    options.update(overrides)
+    return CircuitBreaker(CircuitBreakerConfig(**options))
+
+def trip(breaker: CircuitBreaker):
+    for _ in range(breaker.config.min_calls):
+        breaker.record_failure(0.1)
+    assert breaker.state == CircuitState.OPEN
+
+def test_opens_on_failure_rate():
+    breaker = make_breaker()
+    breaker.record_success(0.1)
+    breaker.record_failure(0.1)
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+def test_opens_on_slow_calls():
+    breaker = make_breaker(slow_call_seconds=1.0)
+    breaker.record_success(2.0)
+    breaker.record_success(2.0)
+    assert breaker.state == CircuitState.OPEN
+
+def test_half_open_allows_limited_probes():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.02)
+    assert breaker.allow_request()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow_request()
+
+def test_probe_success_closes():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.02)
+    assert breaker.allow_request()
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+def test_probe_failure_reopens():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.02)
+    assert breaker.allow_request()
+    breaker.record_failure(0.1)
+    assert breaker.state == CircuitState.OPEN
+
+def test_released_probe_can_be_retaken():
+    breaker = make_breaker()
+    trip(breaker)
+    time.sleep(0.02)
+    assert breaker.allow_request()
+    breaker.release_probe()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+
+def test_timeout_follows_p99_within_bounds():
+    breaker = make_breaker(min_calls=100, min_timeout=1.0, max_timeout=10.0)
+    assert breaker.current_timeout() == 10.0
+    for _ in range(10):
+        breaker.record_success(2.0)
+    assert breaker.current_timeout() == pytest.approx(3.0)
+    for _ in range(10):
+        breaker.record_success(0.1)
+    assert breaker.current_timeout() == pytest.approx(3.0)
+
+class FakeYoutubeDL:
+    """Stands in for yt_dlp.YoutubeDL with a scripted extract_info"""
+
+    def __init__(self, extract):
+        self.extract = extract
+
+    def extract_info(self, url, download=False):
+        return self.extract(url)
+
+class ExpectedError(Exception):
+    """Shaped like yt-dlp's DownloadError wrapping an expected ExtractorError"""
+
+    def __init__(self):
+        super().__init__("Video unavailable")
+        cause = Exception("Private video")
+        cause.expected = True
+        self.exc_info = (type(cause), cause, None)
+
+def make_service(extract, **overrides) -> YouTubeService:
+    options = {"min_calls": 2, "open_seconds": 0.01}
+    options.update(overrides)
+    service = YouTubeService({}, CircuitBreakerConfig(**options))
+    service._ytdl = FakeYoutubeDL(extract)
+    return service
+
+def test_expected_errors_do_not_open_circuit():
+    def extract(url):
+        raise ExpectedError()
+
+    service = make_service(extract)
+
+    async def run():
+        for _ in range(5):
+            with pytest.raises(YouTubeError):
+                await service.extract_track_info("https://youtu.be/private")
+
+    asyncio.run(run())
+    assert service.circuit_breaker.state == CircuitState.CLOSED
+
+def test_cancelled_probe_does_not_wedge_half_open():
+    release = threading.Event()
+
+    def extract(url):
+        release.wait(5)
+        return {"id": "abc", "title": "Song", "url": "https://stream", "duration": 1}
+
+    service = make_service(extract)
+    trip(service.circuit_breaker)
+    time.sleep(0.02)
+
+    async def run():
+        probe = asyncio.ensure_future(service.extract_track_info("https://youtu.be/abc"))
+        await asyncio.sleep(0.05)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        release.set()
+        return await service.extract_track_info("https://youtu.be/abc")
+
+    track = asyncio.run(run())
+    assert track.track_id == "generic:abc"
+    assert service.circuit_breaker.state == CircuitState.CLOSED
+
+def test_open_circuit_serves_cache_then_raises():
+    service = make_service(lambda url: {"id": "abc", "title": "Song", "url": "https://stream"},
+                           open_seconds=60)
+
+    async def run():
+        await service.extract_track_info("https://youtu.be/abc")
+        trip(service.circuit_breaker)
+        cached = await service.extract_track_info("https://youtu.be/abc", requester_id="42")
+        assert cached.requester_id == "42"
+        with pytest.raises(CircuitOpenError):
+            await service.extract_track_info("https://youtu.be/other")
+
+    asyncio.run(run())
+
+def test_stats_while_calls_are_recorded_from_another_thread():
+    breaker = make_breaker(min_calls=10_000, window_size=50)
+    stop = threading.Event()
+
+    def record():
+        while not stop.is_set():
+            breaker.record_success(0.1)
+
+    writer = threading.Thread(target=record)
+    writer.start()
+    try:
+        for _ in range(2000):
+            stats = breaker.stats()
+            assert stats["calls"] <= 50
+    finally:
+        stop.set()
+        writer.join()
+    assert breaker.stats()["p99_latency"] == 0.1
+
+def test_rejecting_does_not_take_a_probe():
+    breaker = make_breaker()
+    assert not breaker.rejecting()
+    trip(breaker)
+    assert breaker.rejecting()
+    time.sleep(0.02)
+    assert not breaker.rejecting()
+    assert breaker.allow_request()
+    assert breaker.rejecting()
+
+def test_open_circuit_refuses_play_before_joining_voice():
+    from music_bot.core.bot import MusicBot
+
+    service = make_service(lambda url: {"id": "abc", "title": "Song", "url": "https://stream"},
+                           open_seconds=60)
+    joined = []
+
+    async def join_channel(channel_id, guild_id):
+        joined.append(guild_id)
+
+    async def play(guild_id, url, user_id):
+        return await service.extract_track_info(url, user_id)
+
+    bot = SimpleNamespace(youtube_service=service,
+                          voice_manager=SimpleNamespace(join_channel=join_channel),
+                          music_player=SimpleNamespace(play=play))
+
+    async def run():
+        await service.extract_track_info("https://youtu.be/abc")
+        trip(service.circuit_breaker)
+        with pytest.raises(CircuitOpenError):
+            await MusicBot.play_music(bot, 1, 2, "https://youtu.be/other")
+        assert joined == []
+        track = await MusicBot.play_music(bot, 1, 2, "https://youtu.be/abc")
+        assert track.title == "Song"
+        assert joined == [1]
+
+    asyncio.run(run())
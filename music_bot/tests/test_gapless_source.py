@@ -0,0 +1,107 @@
+import threading
+import time
+
+from benchmarks.fake_voice import SyntheticSource, frame_tag
+from music_bot.config.setting import PlaybackConfig
+from music_bot.core.music_player import GaplessAudioSource
+from music_bot.core.playback_engine import OPUS_SILENCE
+from music_bot.models.music import Track
+
+def make_track(tag: int, duration: int = 0) -> Track:
+    return Track(title=f"track-{tag}", url=f"synthetic://{tag}", duration=duration,
+                 track_id=f"synthetic:{tag}")
+
+def test_read_pads_with_silence_while_next_track_starts():
+    release = threading.Event()
+
+    def next_source():
+        release.wait(5)
+        return SyntheticSource(2, 3), make_track(2)
+
+    source = GaplessAudioSource(SyntheticSource(1, 2), make_track(1), next_source,
+                                PlaybackConfig(prebuffer_frames=1))
+    assert frame_tag(source.read()) == 1
+    assert frame_tag(source.read()) == 1
+
+    started = time.monotonic()
+    assert source.read() == OPUS_SILENCE
+    assert time.monotonic() - started < 0.1
+
+    release.set()
+    deadline = time.monotonic() + 2
+    data = source.read()
+    while data == OPUS_SILENCE and time.monotonic() < deadline:
+        time.sleep(0.01)
+        data = source.read()
+    assert frame_tag(data) == 2
+    assert source.track.track_id == "synthetic:2"
+
+def test_read_ends_when_next_track_never_arrives():
+    config = PlaybackConfig(next_source_timeout=0.05)
+    source = GaplessAudioSource(SyntheticSource(1, 1), make_track(1),
+                                lambda: time.sleep(5), config)
+    source.read()
+    assert source.read() == OPUS_SILENCE
+    time.sleep(0.1)
+    assert source.read() == b''
+
+def test_read_ends_when_queue_is_empty():
+    source = GaplessAudioSource(SyntheticSource(1, 1), make_track(1), lambda: None,
+                                PlaybackConfig())
+    source.read()
+    deadline = time.monotonic() + 2
+    data = source.read()
+    while data and time.monotonic() < deadline:
+        time.sleep(0.01)
+        data = source.read()
+    assert data == b''
+
+def test_switch_after_cleanup_releases_new_source():
+    source = GaplessAudioSource(SyntheticSource(1, 10), make_track(1), lambda: None,
+                                PlaybackConfig())
+    source.cleanup()
+    replacement = SyntheticSource(2, 10)
+    source.switch_to(replacement, make_track(2))
+    assert replacement.cleaned_up
+
+def test_preloaded_track_is_reported_as_next():
+    queue = [make_track(2)]
+
+    def next_source():
+        return (SyntheticSource(2, 10), queue.pop(0)) if queue else None
+
+    config = PlaybackConfig(preload_seconds=1.0, prebuffer_frames=1)
+    source = GaplessAudioSource(SyntheticSource(1, 100), make_track(1, duration=2),
+                                next_source, config)
+    assert source.next_track() is None
+    for _ in range(60):
+        source.read()
+    deadline = time.monotonic() + 2
+    while source.next_track() is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert source.next_track().track_id == "synthetic:2"
+    assert not queue
+
+def test_superseded_preloaded_track_is_requeued():
+    queue = [make_track(2)]
+
+    def next_source():
+        return (SyntheticSource(2, 10), queue.pop(0)) if queue else None
+
+    config = PlaybackConfig(preload_seconds=1.0, prebuffer_frames=1)
+    source = GaplessAudioSource(SyntheticSource(1, 100), make_track(1, duration=2),
+                                next_source, config, requeue=lambda track: queue.insert(0, track))
+    for _ in range(60):
+        source.read()
+    deadline = time.monotonic() + 2
+    while source.next_track() is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not queue
+
+    source.switch_to(SyntheticSource(3, 10), make_track(3))
+    data = source.read()
+    while frame_tag(data) != 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+        data = source.read()
+    assert frame_tag(data) == 3
+    assert [track.track_id for track in queue] == ["synthetic:2"]
@@ -0,0 +1,45 @@
+import threading
+
+from benchmarks.fake_voice import FakeVoiceClient, SyntheticSource, start_loop
+from music_bot.core.playback_engine import MultiplexedEngine
+
+loop = start_loop()
+
+def play(engine: MultiplexedEngine, voice_client: FakeVoiceClient,
+         frames: int = 10_000) -> threading.Event:
+    finished = threading.Event()
+    engine.play(voice_client.guild.id, voice_client, SyntheticSource(1, frames),
+                lambda error: finished.set())
+    return finished
+
+def test_session_on_replaced_voice_client_is_retired():
+    engine = MultiplexedEngine()
+    old_client = FakeVoiceClient(loop, guild_id=1)
+    old_finished = play(engine, old_client)
+    assert engine.is_playing(1, old_client)
+
+    new_client = FakeVoiceClient(loop, guild_id=1)
+    assert not engine.is_playing(1, new_client)
+    assert engine.get_source(1, new_client) is None
+    assert old_finished.wait(1)
+
+    new_finished = play(engine, new_client, frames=5)
+    assert new_finished.wait(1)
+    assert len(new_client.packets) == 5
+
+def test_session_stops_when_client_disconnects():
+    engine = MultiplexedEngine(reconnect_grace=30)
+    voice_client = FakeVoiceClient(loop, guild_id=2)
+    finished = play(engine, voice_client)
+    voice_client.disconnect()
+    assert finished.wait(1)
+
+def test_session_waits_while_client_reconnects():
+    engine = MultiplexedEngine(reconnect_grace=30)
+    voice_client = FakeVoiceClient(loop, guild_id=3)
+    finished = play(engine, voice_client)
+    voice_client._connected = False
+    assert not finished.wait(0.2)
+    voice_client._connected = True
+    engine.stop(3, voice_client)
+    assert finished.wait(1)
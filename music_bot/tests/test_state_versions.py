@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from music_bot.api.server import BotHandle, create_app
+from music_bot.config.setting import APIConfig
+from music_bot.utils.versioning import StateVersions
+
+def test_bump_advances_per_guild():
+    versions = StateVersions()
+    assert versions.get(1) == 0
+    assert versions.bump(1) == 1
+    assert versions.bump(1) == 2
+    assert versions.get(2) == 0
+    assert versions.etag(1, 2) != StateVersions().etag(1, 2)
+
+def test_wait_for_returns_immediately_when_reached():
+    versions = StateVersions()
+    versions.bump(1)
+    assert asyncio.run(versions.wait_for(1, 1, timeout=5)) == 1
+
+def test_wait_for_wakes_on_bump_from_another_thread():
+    versions = StateVersions()
+
+    async def wait():
+        threading.Timer(0.05, versions.bump, args=(1,)).start()
+        return await versions.wait_for(1, 1, timeout=5)
+
+    assert asyncio.run(wait()) == 1
+    assert not versions._waiters
+
+def test_wait_for_times_out_with_current_version():
+    versions = StateVersions()
+    assert asyncio.run(versions.wait_for(1, 3, timeout=0.05)) == 0
+    assert not versions._waiters
+
+class FakeBot:
+    def __init__(self):
+        self.state_versions = StateVersions()
+        self.settings = SimpleNamespace(api=APIConfig())
+        self.connected = True
+        self.status_calls = 0
+
+    def get_status(self, guild_id: int) -> dict:
+        self.status_calls += 1
+        return {"connected": self.connected, "playback_state": {}, "queue": []}
+
+@pytest.fixture
+def bot():
+    return FakeBot()
+
+@pytest.fixture
+def client(bot):
+    handle = BotHandle()
+    handle.attach(bot)
+    return TestClient(create_app(handle))
+
+def test_status_answers_304_until_version_changes(client, bot):
+    first = client.get("/status/1")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    unchanged = client.get("/status/1", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert bot.status_calls == 1
+
+    # The bot being moved or kicked bumps the version
+    bot.connected = False
+    bot.state_versions.bump(1)
+    changed = client.get("/status/1", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["connected"] is False
+
+def test_status_long_poll_returns_after_bump(client, bot):
+    threading.Timer(0.05, bot.state_versions.bump, args=(1,)).start()
+    response = client.get("/status/1", params={"wait_for_version": 1, "timeout": 5})
+    assert response.status_code == 200
+    assert response.json()["version"] == 1